@@ -0,0 +1,186 @@
+"""Suite benchmark headless untuk jalur panas simulasi dan rendering.
+
+Setiap kasus dijalankan pada beberapa ukuran grid dan kepadatan hutan dari
+state awal yang sama (dipulihkan dari snapshot sebelum setiap pengulangan),
+lalu median/min waktunya ditulis sebagai JSON. Dengan --baseline hasilnya
+dibandingkan dengan file hasil sebelumnya (misalnya bench_baseline.json) dan
+program keluar dengan status 1 bila ada regresi:
+
+    python bench.py --out hasil.json --baseline bench_baseline.json
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from renderer import Renderer
+from simulation import SIM_SIZE, DeforestationSimulation, TreeStore
+from snapshot import restore_bytes, snapshot_bytes
+
+BENCH_SEED = 1234
+DEFAULT_GRIDS = (20, 50, 100)
+DEFAULT_DENSITIES = (0.2, 0.5, 0.9) # Bagian sel darat yang berpohon
+DEFAULT_REPEAT = 7
+DEFAULT_THRESHOLD = 0.15 # Waktu minimum lebih lambat dari ini (relatif) dianggap regresi
+NOISE_FLOOR_MS = 0.05 # Selisih absolut di bawah ini dianggap derau pengukuran
+BENCH_PARTICLES = 5000
+
+def make_scenario(grid, density, seed=BENCH_SEED):
+    """Simulasi ber-seed dengan bagian sel darat berpohon sebesar `density`."""
+    sim = DeforestationSimulation(terrain_grid=grid, seed=seed)
+    cells = np.flatnonzero(sim.land_mask & (sim.trees.cell_index < 0))
+    target = int(density * np.count_nonzero(sim.land_mask))
+    if len(sim.trees) < target:
+        extra = sim.rng.choice(cells, min(cells.size, target - len(sim.trees)), replace=False)
+        for cell in extra.tolist():
+            sim.add_tree_by_grid(cell % grid, cell // grid)
+    elif len(sim.trees) > target:
+        sim.clear_cut(1.0 - target / len(sim.trees))
+    sim.particles.clear()
+    sim.stump_map[:] = False
+    sim.stump_count = 0
+    return sim
+
+# ============ Kasus Benchmark ============
+# Setiap kasus: fungsi(sim, renderer, surface) yang diukur, dan fungsi persiapan
+# opsional (tidak diukur) yang dijalankan setelah state dipulihkan.
+def _with_particles(sim, renderer, surface):
+    sim.particles.emit(np.linspace(0, SIM_SIZE, BENCH_PARTICLES), SIM_SIZE / 2, (120, 80, 40), size_range=(3, 7))
+
+def _fresh_forest(sim, renderer, surface):
+    # Kondisi seperti initialize_state(): belum ada pohon, tunggul, maupun vegetasi yang rusak
+    sim.trees = TreeStore(sim.terrain_grid)
+    sim.stump_map[:] = False
+    sim.stump_count = 0
+    sim.deforestation_map[:] = 0.9
+
+def _with_stumps(sim, renderer, surface):
+    sim.clear_cut(0.5)
+
+def _warm_terrain(sim, renderer, surface):
+    renderer.draw_terrain(surface)
+
+def _warm_trees(sim, renderer, surface):
+    renderer.draw_trees(surface)
+
+def _full_terrain(sim, renderer, surface):
+    renderer.full_redraw = True
+    renderer.draw_terrain(surface)
+
+CASES = {
+    'initialize_river': (lambda sim, r, s: sim.initialize_river(), None),
+    'initialize_forest': (lambda sim, r, s: sim.initialize_forest(), _fresh_forest),
+    'update_erosion_risk': (lambda sim, r, s: sim.update_erosion_risk(), None),
+    'landslide_effect': (lambda sim, r, s: sim.landslide_effect(), None),
+    'flood_effect': (lambda sim, r, s: sim.flood_effect(True), None),
+    'earthquake_effect': (lambda sim, r, s: sim.earthquake_effect(), None),
+    'drought_effect': (lambda sim, r, s: sim.drought_effect(), None),
+    'get_flooded_area': (lambda sim, r, s: sim.get_flooded_area(radius=5), None),
+    'draw_terrain_full': (_full_terrain, _warm_terrain),
+    'draw_terrain_cached': (lambda sim, r, s: r.draw_terrain(s), _warm_terrain),
+    'draw_stumps': (lambda sim, r, s: r.draw_stumps(s), _with_stumps),
+    'draw_trees': (lambda sim, r, s: r.draw_trees(s), None),
+    'draw_trees_warm': (lambda sim, r, s: r.draw_trees(s), _warm_trees),
+    'particles_update': (lambda sim, r, s: sim.particles.update(16), _with_particles),
+    'particles_draw': (lambda sim, r, s: r.draw_particles(s, sim.particles), _with_particles),
+}
+
+def time_case(state, fn, setup, repeat):
+    """Median/min/mean (ms) dari `repeat` pemanggilan, masing-masing dari state yang sama."""
+    surface = pygame.Surface((SIM_SIZE, SIM_SIZE))
+    samples = []
+    for _ in range(repeat):
+        sim = restore_bytes(state)
+        renderer = Renderer(sim)
+        if setup is not None:
+            setup(sim, renderer, surface)
+        start = time.perf_counter_ns()
+        fn(sim, renderer, surface)
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    return {'median_ms': statistics.median(samples), 'min_ms': min(samples),
+            'mean_ms': statistics.fmean(samples), 'repeat': repeat}
+
+def run_suite(grids=DEFAULT_GRIDS, densities=DEFAULT_DENSITIES, repeat=DEFAULT_REPEAT, cases=None):
+    pygame.init()
+    results = {}
+    for grid in grids:
+        for density in densities:
+            state = snapshot_bytes(make_scenario(grid, density))
+            for name in cases or CASES:
+                fn, setup = CASES[name]
+                key = f'{name}[grid={grid},density={density}]'
+                results[key] = time_case(state, fn, setup, repeat)
+                print(f"{key:55s} {results[key]['median_ms']:9.3f} ms", file=sys.stderr)
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'seed': BENCH_SEED,
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, noise_floor=NOISE_FLOOR_MS):
+    """Daftar (kasus, baseline_ms, sekarang_ms, rasio, regresi?) untuk kasus yang ada di keduanya.
+
+    Dibandingkan waktu minimum, yang paling tahan terhadap gangguan proses
+    lain; kasus yang hanya lebih lambat kurang dari `noise_floor` ms tidak
+    dihitung sebagai regresi.
+    """
+    rows = []
+    for key, res in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        base_ms, cur_ms = base['min_ms'], res['min_ms']
+        ratio = cur_ms / base_ms if base_ms > 0 else float('inf')
+        regressed = ratio > 1.0 + threshold and cur_ms - base_ms > noise_floor
+        rows.append((key, base_ms, cur_ms, ratio, regressed))
+    return rows
+
+# ============ Main Execution ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark headless simulasi deforestasi")
+    parser.add_argument('--grids', default=','.join(map(str, DEFAULT_GRIDS)), help="Ukuran grid, dipisah koma")
+    parser.add_argument('--densities', default=','.join(map(str, DEFAULT_DENSITIES)), help="Kepadatan hutan, dipisah koma")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Pengulangan per kasus")
+    parser.add_argument('--case', action='append', choices=sorted(CASES), help="Jalankan kasus ini saja (boleh berulang)")
+    parser.add_argument('--out', default=None, help="Tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument('--baseline', default=None, help="File hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Batas regresi relatif (default: 0.15)")
+    parser.add_argument('--noise-floor', type=float, default=NOISE_FLOOR_MS, help="Selisih minimum (ms) untuk regresi")
+    args = parser.parse_args()
+
+    report = run_suite([int(g) for g in args.grids.split(',')], [float(d) for d in args.densities.split(',')],
+                       args.repeat, args.case)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold, args.noise_floor)
+        regressions = [row for row in rows if row[4]]
+        print(f"\n{'kasus':55s} {'baseline':>9s} {'sekarang':>9s} {'rasio':>6s}", file=sys.stderr)
+        for key, base_ms, cur_ms, ratio, regressed in rows:
+            print(f"{key:55s} {base_ms:9.3f} {cur_ms:9.3f} {ratio:6.2f}{'  REGRESI' if regressed else ''}", file=sys.stderr)
+        print(f"{len(regressions)} regresi dari {len(rows)} kasus (batas +{args.threshold:.0%})", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
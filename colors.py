@@ -0,0 +1,34 @@
+# ========== WARNA (Diadaptasi untuk tampilan yang lebih halus) ==========
+COLOR_WHITE = (255, 255, 255)
+COLOR_BLACK = (0, 0, 0)
+COLOR_DARK_BLUE = (28, 42, 52) 
+COLOR_UI_DARK = (40, 60, 74) 
+COLOR_UI_BORDER = (85, 120, 140)
+COLOR_UI_HIGHLIGHT = (140, 190, 220) 
+COLOR_BUTTON_NORMAL = (60, 90, 110)
+COLOR_BUTTON_HOVER = (80, 120, 140)
+COLOR_BUTTON_DANGER = (200, 60, 60)
+COLOR_BUTTON_DANGER_HOVER = (230, 80, 80)
+COLOR_BUTTON_SAFE = (70, 200, 70)
+COLOR_BUTTON_SAFE_HOVER = (90, 220, 90)
+COLOR_BUTTON_RESET = (200, 150, 50)
+COLOR_BUTTON_RESET_HOVER = (230, 180, 70)
+
+# Terrain Colors
+COLOR_SOIL = (150, 90, 40) 
+COLOR_DEFORESTED = (160, 100, 50)
+COLOR_HEALTHY_GRASS = (90, 180, 80) 
+COLOR_CANOPY_BASE = (30, 100, 40) 
+COLOR_STUMP_TOP = (180, 130, 90)
+
+# Disaster/Water Colors
+COLOR_WARNING = (255, 165, 0)
+COLOR_DANGER = (255, 50, 50)
+COLOR_SAFE = (70, 200, 70)
+COLOR_WATER = (90, 140, 180) 
+COLOR_DEEP_WATER = (60, 100, 130) 
+COLOR_DRY = (180, 120, 80) 
+COLOR_RAIN = (120, 180, 220, 150) 
+COLOR_FLOOD = (50, 100, 160) 
+COLOR_STORM_CLOUD = (40, 50, 60, 180) # Awan gelap untuk hujan
+COLOR_WATER_KEY = (255, 0, 255) # Colorkey lapisan air (sel tanpa air)
@@ -0,0 +1,202 @@
+"""Ensemble Monte Carlo: banyak simulasi headless ber-seed di process pool.
+
+Setiap worker menjalankan sekelompok seed, merekam metrik setiap
+`sample_every` tick, lalu hanya mengirim statistik ringkas (EnsembleStats)
+ke proses induk. Induk menggabungkan statistik itu satu per satu saat hasil
+tiba, jadi memori induk tidak bergantung pada jumlah run.
+"""
+import argparse
+import multiprocessing
+import os
+
+import numpy as np
+
+from simulation import DeforestationSimulation, MASS_CUT_FRACTION, SimulationConfig, TICK_MS
+
+METRICS = ('trees', 'stumps', 'erosion_risk', 'total_disasters', 'trees_lost')
+HIST_BINS = 256 # Resolusi histogram untuk estimasi kuantil
+POLICY_INTERVAL_TICKS = 600 # Jarak antar intervensi kebijakan (10 detik simulasi)
+ENSEMBLE_CHUNKS = 64 # Target jumlah chunk; cukup untuk menyeimbangkan beban di banyak core
+
+# ============ Kebijakan Deforestasi ============
+def policy_none(sim, tick):
+    """Hutan dibiarkan; hanya bencana yang mengubahnya."""
+
+def policy_mass_cut(sim, tick):
+    """Penebangan massal (seperti tombol UI) secara berkala."""
+    if tick % POLICY_INTERVAL_TICKS == 0:
+        sim.clear_cut(MASS_CUT_FRACTION)
+
+def policy_selective(sim, tick):
+    """Tebang pilih 5% pohon secara berkala."""
+    if tick % POLICY_INTERVAL_TICKS == 0:
+        sim.clear_cut(0.05)
+
+POLICIES = {
+    'none': policy_none,
+    'mass_cut': policy_mass_cut,
+    'selective': policy_selective,
+}
+
+def collect_metrics(sim):
+    return (len(sim.trees), sim.stump_count, sim.erosion_risk,
+            sim.total_disasters, sim.trees_lost_to_disaster)
+
+def metric_ranges(grid, ticks, config=None):
+    """Rentang histogram per metrik; nilai di luar rentang masuk bin tepi."""
+    cfg = config if config is not None else SimulationConfig()
+    cells = grid * grid
+    # Dua bencana berurutan minimal berjarak durasi minimum + cooldown (minimal satu tick)
+    period_ms = max((cfg.disaster_duration_min + cfg.disaster_cooldown) * 1000.0, TICK_MS)
+    max_disasters = ticks * TICK_MS / period_ms + 1
+    return np.array([(0, cells), (0, cells), (0, 1), (0, max_disasters), (0, cells)], dtype=np.float64)
+
+# ============ Reduksi Streaming ============
+class EnsembleStats:
+    """Mean/varian (Welford) dan histogram per (sampel, metrik) yang bisa digabung.
+
+    `mean`, `m2`, `min`, `max` dan `hist` berbentuk (n_samples, n_metrics[, bins]);
+    kuantil diestimasi dari histogram dengan interpolasi linear di dalam bin,
+    lalu dibatasi ke nilai minimum/maksimum yang benar-benar teramati.
+    """
+    def __init__(self, sample_ticks, ranges, bins=HIST_BINS):
+        self.sample_ticks = np.asarray(sample_ticks)
+        self.ranges = np.asarray(ranges, dtype=np.float64)
+        self.bins = bins
+        shape = (self.sample_ticks.size, len(self.ranges))
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.hist = np.zeros(shape + (bins,), dtype=np.int64)
+
+    def add_run(self, trajectory):
+        """Menambahkan satu lintasan metrik berbentuk (n_samples, n_metrics)."""
+        x = np.asarray(trajectory, dtype=np.float64)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        np.minimum(self.min, x, out=self.min)
+        np.maximum(self.max, x, out=self.max)
+
+        lo, hi = self.ranges[:, 0], self.ranges[:, 1]
+        b = ((x - lo) / (hi - lo) * self.bins).astype(np.int64)
+        b = np.clip(b, 0, self.bins - 1)
+        s, m = np.indices(b.shape)
+        self.hist[s, m, b] += 1
+
+    def merge(self, other):
+        """Menggabungkan statistik parsial dari worker lain (algoritma paralel Chan)."""
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * (other.count / n)
+        self.m2 += other.m2 + delta ** 2 * (self.count * other.count / n)
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        self.hist += other.hist
+        self.count = n
+        return self
+
+    def std(self):
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    def quantile(self, q):
+        """Estimasi kuantil `q` (0..1) untuk setiap (sampel, metrik)."""
+        cdf = np.cumsum(self.hist, axis=-1)
+        target = q * self.count
+        idx = np.argmax(cdf >= target, axis=-1)
+        before = np.take_along_axis(cdf, idx[..., None], axis=-1)[..., 0] - \
+                 np.take_along_axis(self.hist, idx[..., None], axis=-1)[..., 0]
+        in_bin = np.take_along_axis(self.hist, idx[..., None], axis=-1)[..., 0]
+        frac = np.where(in_bin > 0, (target - before) / np.maximum(in_bin, 1), 0.0)
+        lo, hi = self.ranges[:, 0], self.ranges[:, 1]
+        width = (hi - lo) / self.bins
+        estimate = lo + (idx + np.clip(frac, 0, 1)) * width
+        if self.count == 0:
+            return estimate
+        # Lebar bin bisa lebih dari satu satuan; jangan laporkan nilai di luar data
+        return np.clip(estimate, self.min, self.max)
+
+    def summary(self, quantiles=(0.05, 0.5, 0.95)):
+        """Ringkasan metrik pada sampel terakhir (akhir simulasi)."""
+        qs = {q: self.quantile(q)[-1] for q in quantiles}
+        std = self.std()[-1]
+        return {name: {'mean': float(self.mean[-1, k]), 'std': float(std[k]),
+                       **{f'q{round(q * 100)}': float(qs[q][k]) for q in quantiles}}
+                for k, name in enumerate(METRICS)}
+
+# ============ Eksekusi ============
+def run_member(seed, grid, ticks, sample_every, policy='none', config=None):
+    """Menjalankan satu simulasi headless dan mengembalikan lintasan metriknya."""
+    apply_policy = POLICIES[policy]
+    sim = DeforestationSimulation(terrain_grid=grid, seed=seed, config=config)
+    trajectory = np.empty((ticks // sample_every, len(METRICS)))
+    for tick in range(1, ticks + 1):
+        apply_policy(sim, tick)
+        sim.step()
+        if tick % sample_every == 0:
+            trajectory[tick // sample_every - 1] = collect_metrics(sim)
+    return trajectory
+
+def _run_chunk(task):
+    seeds, grid, ticks, sample_every, policy, config = task
+    stats = EnsembleStats(np.arange(1, ticks // sample_every + 1) * sample_every, metric_ranges(grid, ticks, config))
+    for seed in seeds:
+        stats.add_run(run_member(seed, grid, ticks, sample_every, policy, config))
+    return stats
+
+def run_ensemble(n_runs, ticks=3600, grid=20, policy='none', base_seed=0,
+                 sample_every=60, processes=None, chunk_size=None, config=None):
+    """Menjalankan `n_runs` simulasi (seed base_seed..base_seed+n_runs-1) secara paralel.
+
+    Pembagian chunk hanya bergantung pada `n_runs` (atau `chunk_size`), dan
+    hasil digabung menurut urutan indeks chunk, sehingga statistik akhir sama
+    persis untuk argumen yang sama, berapa pun jumlah proses.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Kebijakan tidak dikenal: {policy} (pilihan: {', '.join(POLICIES)})")
+    if not 0 < sample_every <= ticks:
+        # Tanpa satu pun sampel lintasan kosong dan summary() tidak punya nilai akhir
+        raise ValueError(f"ticks ({ticks}) harus minimal sample_every ({sample_every}) dan sample_every > 0")
+    processes = processes or os.cpu_count() or 1
+    if chunk_size is None:
+        # Tidak bergantung pada jumlah proses: urutan penggabungan Chan ikut menentukan hasil
+        chunk_size = max(1, -(-n_runs // ENSEMBLE_CHUNKS))
+    seeds = range(base_seed, base_seed + n_runs)
+    tasks = [(seeds[i:i + chunk_size], grid, ticks, sample_every, policy, config)
+             for i in range(0, n_runs, chunk_size)]
+
+    stats = EnsembleStats(np.arange(1, ticks // sample_every + 1) * sample_every, metric_ranges(grid, ticks, config))
+    if processes == 1:
+        for task in tasks:
+            stats.merge(_run_chunk(task))
+        return stats
+    with multiprocessing.Pool(processes) as pool:
+        # imap mengembalikan hasil menurut urutan task, bukan urutan selesai
+        for partial in pool.imap(_run_chunk, tasks):
+            stats.merge(partial)
+    return stats
+
+# ============ Main Execution ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ensemble Monte Carlo simulasi deforestasi")
+    parser.add_argument('--runs', type=int, default=32, help="Jumlah simulasi (default: 32)")
+    parser.add_argument('--ticks', type=int, default=3600, help="Tick per simulasi (default: 3600 = 60 detik)")
+    parser.add_argument('--grid', type=int, default=20, help="Jumlah sel grid per sisi (default: 20)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='none', help="Kebijakan deforestasi")
+    parser.add_argument('--seed', type=int, default=0, help="Seed pertama (default: 0)")
+    parser.add_argument('--processes', type=int, default=None, help="Jumlah proses (default: semua core)")
+    args = parser.parse_args()
+
+    stats = run_ensemble(args.runs, ticks=args.ticks, grid=args.grid, policy=args.policy,
+                         base_seed=args.seed, processes=args.processes)
+    print(f"Ensemble {stats.count} run, kebijakan '{args.policy}', {args.ticks} tick:")
+    for name, s in stats.summary().items():
+        print(f"  {name:16s} mean={s['mean']:9.3f} std={s['std']:8.3f} "
+              f"q5={s['q5']:9.3f} q50={s['q50']:9.3f} q95={s['q95']:9.3f}")
@@ -0,0 +1,160 @@
+"""Perekam time-series metrik simulasi dengan memori terbatas.
+
+Sampel ditulis ke ring buffer yang dialokasikan sekali, dibagi menjadi
+beberapa chunk. Chunk yang penuh diserahkan ke thread latar belakang untuk
+ditulis ke CSV atau file biner kolumnar, lalu dipakai ulang. Secara
+default loop frame tidak pernah menunggu disk: bila semua chunk masih antre,
+sampel dibuang dan dihitung di `dropped`. Run batch headless yang harus
+lengkap memakai block=True sehingga sample() menunggu chunk bebas.
+"""
+import json
+import queue
+import struct
+import threading
+
+import numpy as np
+
+METRICS_MAGIC = b'DEFMETR\x00'
+METRICS_VERSION = 1
+_HEADER = struct.Struct('<8sII')
+_BLOCK = struct.Struct('<I')
+
+COLUMNS = np.dtype([
+    ('tick', '<u4'),
+    ('erosion_risk', '<f4'),
+    ('warning_level', 'u1'),
+    ('trees', '<u4'),
+    ('stumps', '<u4'),
+    ('raining', 'u1'),
+    ('disaster', 'u1'), # Kode DISASTER_CODES bila bencana aktif, 0 jika tidak
+    ('total_disasters', '<u4'),
+    ('trees_lost', '<u4'),
+    # Durasi fase frame terakhir yang selesai sebelum tick ini (NaN bila tidak
+    # diukur, misalnya saat headless); beberapa tick dalam satu frame berbagi nilainya
+    ('update_ms', '<f4'),
+    ('draw_ms', '<f4'),
+    ('panel_ms', '<f4'),
+])
+DISASTER_CODES = {'landslide': 1, 'flood': 2, 'earthquake': 3, 'drought': 4}
+CSV_FORMATS = {'u': '%d', 'f': '%.6g'}
+
+class MetricsRecorder:
+    """Merekam satu baris COLUMNS per panggilan sample() ke `path`.
+
+    fmt='csv' menulis teks; fmt='bin' menulis header JSON lalu blok kolumnar
+    (jumlah baris, kemudian setiap kolom kontigu), dibaca dengan read_metrics().
+    Format biner jauh lebih murah untuk thread penulis dan cocok untuk
+    merekam setiap tick pada kecepatan headless penuh.
+    """
+    def __init__(self, path, fmt='csv', chunk_size=4096, n_chunks=8, block=False):
+        if fmt not in ('csv', 'bin'):
+            raise ValueError(f"Format metrik tidak dikenal: {fmt}")
+        self.fmt = fmt
+        self.block = block
+        self.chunk_size = chunk_size
+        self.buffer = np.zeros((n_chunks, chunk_size), dtype=COLUMNS)
+        self.free = queue.SimpleQueue()
+        for c in range(1, n_chunks):
+            self.free.put(c)
+        self.current = 0
+        self.fill = 0
+        self.recorded = 0
+        self.dropped = 0
+
+        self._file = open(path, 'w' if fmt == 'csv' else 'wb')
+        if fmt == 'csv':
+            self._file.write(','.join(COLUMNS.names) + '\n')
+            self._csv_fmt = ','.join(CSV_FORMATS[COLUMNS[name].kind] for name in COLUMNS.names) + '\n'
+        else:
+            meta = json.dumps({'columns': [(name, COLUMNS[name].str) for name in COLUMNS.names]}).encode('utf-8')
+            self._file.write(_HEADER.pack(METRICS_MAGIC, METRICS_VERSION, len(meta)))
+            self._file.write(meta)
+        self._pending = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer, name='metrics-writer', daemon=True)
+        self._thread.start()
+
+    def sample(self, sim, update_ms=np.nan, draw_ms=np.nan, panel_ms=np.nan):
+        if self.current is None:
+            # Semua chunk masih ditulis; coba ambil chunk yang sudah bebas
+            try:
+                self.current = self.free.get(block=self.block)
+            except queue.Empty:
+                self.dropped += 1
+                return
+        disaster = DISASTER_CODES.get(sim.disaster_type, 0) if sim.disaster_active else 0
+        self.buffer[self.current, self.fill] = (
+            sim.tick_count, sim.erosion_risk, sim.warning_level, sim.trees.count, sim.stump_count,
+            sim.is_raining, disaster, sim.total_disasters, sim.trees_lost_to_disaster,
+            update_ms, draw_ms, panel_ms)
+        self.fill += 1
+        self.recorded += 1
+        if self.fill == self.chunk_size:
+            self._submit()
+
+    def _submit(self):
+        self._pending.put((self.current, self.fill))
+        self.fill = 0
+        try:
+            self.current = self.free.get_nowait()
+        except queue.Empty:
+            self.current = None
+
+    def _writer(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            c, n = item
+            rows = self.buffer[c, :n]
+            if self.fmt == 'csv':
+                fmt = self._csv_fmt
+                self._file.write(''.join([fmt % row for row in rows.tolist()]))
+            else:
+                self._file.write(_BLOCK.pack(n))
+                for name in COLUMNS.names:
+                    self._file.write(np.ascontiguousarray(rows[name]).data)
+            self._file.flush()
+            self.free.put(c)
+
+    def close(self):
+        """Menulis sisa baris, menghentikan thread penulis, dan menutup file."""
+        if self._thread is None:
+            return
+        if self.current is not None and self.fill:
+            self._submit()
+        self._pending.put(None)
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_metrics(path):
+    """Membaca file metrik (CSV atau biner) menjadi array terstruktur COLUMNS."""
+    with open(path, 'rb') as f:
+        head = f.read(_HEADER.size)
+        if not head.startswith(METRICS_MAGIC):
+            f.seek(0)
+            # Satu baris data dikembalikan genfromtxt sebagai array 0-d
+            rows = np.atleast_1d(np.genfromtxt(f, delimiter=',', names=True, dtype=None))
+            return rows.astype(COLUMNS) if rows.size else np.zeros(0, dtype=COLUMNS)
+        _, version, meta_len = _HEADER.unpack(head)
+        if version != METRICS_VERSION:
+            raise ValueError(f"Versi file metrik {version} tidak didukung (diharapkan {METRICS_VERSION})")
+        meta = json.loads(f.read(meta_len))
+        dtype = np.dtype([tuple(col) for col in meta['columns']])
+        blocks = []
+        while True:
+            raw = f.read(_BLOCK.size)
+            if len(raw) < _BLOCK.size:
+                break
+            n, = _BLOCK.unpack(raw)
+            block = np.zeros(n, dtype=dtype)
+            for name in dtype.names:
+                block[name] = np.frombuffer(f.read(n * dtype[name].itemsize), dtype=dtype[name])
+            blocks.append(block)
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=dtype)
@@ -0,0 +1,129 @@
+"""Profiler frame: durasi per fase dengan perf_counter_ns dan statistik bergulir.
+
+Pemakaian per frame:
+
+    profiler.begin_frame()
+    with profiler.phase('update'):
+        ...
+    profiler.count('particles', n)
+    profiler.end_frame()
+
+Statistik (ms untuk fase, nilai mentah untuk counter) tersedia lewat stats()
+untuk overlay maupun benchmark. Modul ini tidak bergantung pada pygame.
+"""
+import contextlib
+import sys
+import time
+
+import numpy as np
+
+PROFILER_WINDOW = 120 # Jumlah frame dalam statistik bergulir (2 detik pada 60 FPS)
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        current = self.profiler._current
+        current[self.name] = current.get(self.name, 0) + time.perf_counter_ns() - self.start
+
+class FrameProfiler:
+    """Mengumpulkan durasi fase dan counter per frame ke ring buffer `window` frame.
+
+    Fase dan counter dicatat sesuai urutan pertama kali muncul; frame yang
+    tidak menjalankan suatu fase dihitung 0 untuk fase itu. Counter
+    'alloc_blocks' (selisih sys.getallocatedblocks() per frame) selalu
+    direkam sebagai indikator alokasi objek Python.
+    """
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.frames = 0
+        self.phases = {} # nama -> ring buffer ns
+        self.counters = {} # nama -> ring buffer nilai
+        self._current = {}
+        self._counts = {}
+        self._frame_start = 0
+        self._blocks_start = 0
+
+    def begin_frame(self):
+        self._current = {}
+        self._counts = {}
+        self._blocks_start = sys.getallocatedblocks()
+        self._frame_start = time.perf_counter_ns()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def count(self, name, value):
+        self._counts[name] = value
+
+    def end_frame(self):
+        self._current['frame'] = time.perf_counter_ns() - self._frame_start
+        self._counts['alloc_blocks'] = sys.getallocatedblocks() - self._blocks_start
+        i = self.frames % self.window
+        for rings, values, dtype in ((self.phases, self._current, np.int64),
+                                     (self.counters, self._counts, np.float64)):
+            for name in values:
+                if name not in rings:
+                    rings[name] = np.zeros(self.window, dtype=dtype)
+            for name, ring in rings.items():
+                ring[i] = values.get(name, 0)
+        self.frames += 1
+
+    def last_ms(self, *names):
+        """Jumlah durasi fase `names` pada frame terakhir yang selesai, dalam ms."""
+        if self.frames == 0:
+            return 0.0
+        i = (self.frames - 1) % self.window
+        return sum(int(self.phases[name][i]) for name in names if name in self.phases) * 1e-6
+
+    def stats(self):
+        """{'phases': {nama: {last, mean, p95, max}} dalam ms, 'counters': {nama: {...}}}."""
+        n = min(self.frames, self.window)
+        if n == 0:
+            return {'frames': 0, 'phases': {}, 'counters': {}}
+        last = (self.frames - 1) % self.window
+
+        def summarize(ring, scale):
+            values = ring[:n] * scale
+            return {'last': float(values[last]), 'mean': float(values.mean()),
+                    'p95': float(np.percentile(values, 95)), 'max': float(values.max())}
+
+        return {
+            'frames': self.frames,
+            'phases': {name: summarize(ring, 1e-6) for name, ring in self.phases.items()},
+            'counters': {name: summarize(ring, 1.0) for name, ring in self.counters.items()},
+        }
+
+    def report(self):
+        """Ringkasan teks satu baris per fase/counter."""
+        stats = self.stats()
+        lines = [f"{'fase':14s} {'last':>7s} {'mean':>7s} {'p95':>7s} {'max':>7s}  (ms, {min(self.frames, self.window)} frame)"]
+        for name, s in stats['phases'].items():
+            lines.append(f"{name:14s} {s['last']:7.2f} {s['mean']:7.2f} {s['p95']:7.2f} {s['max']:7.2f}")
+        for name, s in stats['counters'].items():
+            lines.append(f"{name:14s} {s['last']:7.0f} {s['mean']:7.1f} {s['p95']:7.0f} {s['max']:7.0f}")
+        return '\n'.join(lines)
+
+class NullProfiler:
+    """Profiler kosong: hook fase tetap bisa dipanggil tanpa biaya pengukuran."""
+    def begin_frame(self):
+        pass
+
+    def phase(self, name):
+        return contextlib.nullcontext()
+
+    def count(self, name, value):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def last_ms(self, *names):
+        return float('nan')
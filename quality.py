@@ -0,0 +1,120 @@
+"""Pengatur kualitas adaptif berdasarkan waktu frame yang terukur.
+
+Saat bencana dan hujan datang bersamaan, jumlah partikel, garis hujan dan
+pohon yang digambar melonjak pada saat yang sama. QualityGovernor mengamati
+waktu kerja setiap frame dan menurunkan tingkat kualitas bila rata-ratanya
+melebihi anggaran, lalu menaikkannya kembali setelah beban turun.
+
+Setiap tingkat hanya mengubah hal visual: skala emisi partikel debris dan
+hujan (aliran RNG simulasi tetap sama), jumlah awan yang digambar, dan
+detail pohon ('full', 'simple', 'dot'). Modul ini tidak bergantung pada pygame.
+"""
+import dataclasses
+
+QUALITY_WINDOW = 30 # Frame per keputusan (0.5 detik pada 60 FPS)
+QUALITY_DOWNGRADE_AT = 1.0 # Turun tingkat bila rata-rata frame > anggaran x ini
+QUALITY_UPGRADE_AT = 0.6 # Naik tingkat bila rata-rata frame < anggaran x ini ...
+QUALITY_UPGRADE_WINDOWS = 4 # ... selama sekian window berturut-turut
+
+@dataclasses.dataclass(frozen=True)
+class QualityTier:
+    name: str
+    particle_scale: float # Bagian partikel debris yang disimpan saat emit
+    rain_scale: float # Bagian tetes hujan yang disimpan saat emit
+    cloud_scale: float # Bagian awan yang digambar
+    tree_detail: str # 'full', 'simple' atau 'dot'
+
+QUALITY_TIERS = (
+    QualityTier('high', 1.0, 1.0, 1.0, 'full'),
+    QualityTier('medium', 0.5, 0.6, 0.6, 'full'),
+    QualityTier('low', 0.25, 0.35, 0.3, 'simple'),
+    QualityTier('minimal', 0.1, 0.15, 0.0, 'dot'),
+)
+QUALITY_NAMES = tuple(tier.name for tier in QUALITY_TIERS)
+
+class QualityGovernor:
+    """Memilih tingkat QUALITY_TIERS agar waktu frame tetap dalam `budget_ms`.
+
+    observe() dipanggil sekali per frame dengan waktu kerja frame (tanpa waktu
+    tunggu clock). Setiap `window` frame rata-ratanya dibandingkan dengan
+    anggaran: di atas anggaran langsung turun satu tingkat, sedangkan naik
+    tingkat butuh beberapa window yang jauh di bawah anggaran (histeresis)
+    agar kualitas tidak berosilasi. Dengan adaptive=False tingkat tetap.
+    """
+    def __init__(self, budget_ms, window=QUALITY_WINDOW, level=0, adaptive=True):
+        self.budget_ms = budget_ms
+        self.window = window
+        self.level = level
+        self.adaptive = adaptive
+        self.changes = 0
+        self.last_mean_ms = 0.0
+        self._sum = 0.0
+        self._frames = 0
+        self._calm_windows = 0
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.level]
+
+    def set_level(self, level, adaptive=False):
+        """Menetapkan tingkat secara manual (indeks atau nama di QUALITY_NAMES)."""
+        if isinstance(level, str):
+            level = QUALITY_NAMES.index(level)
+        if not 0 <= level < len(QUALITY_TIERS):
+            raise ValueError(f"Tingkat kualitas tidak dikenal: {level}")
+        self.level = level
+        self.adaptive = adaptive
+        self._reset_window()
+
+    def _reset_window(self):
+        self._sum = 0.0
+        self._frames = 0
+        self._calm_windows = 0
+
+    def observe(self, frame_ms):
+        """Mencatat satu frame; mengembalikan True bila tingkat kualitas berubah."""
+        if not self.adaptive:
+            return False
+        self._sum += frame_ms
+        self._frames += 1
+        if self._frames < self.window:
+            return False
+
+        mean = self._sum / self._frames
+        self.last_mean_ms = mean
+        self._sum = 0.0
+        self._frames = 0
+        level = self.level
+        if mean > self.budget_ms * QUALITY_DOWNGRADE_AT:
+            self._calm_windows = 0
+            level = min(level + 1, len(QUALITY_TIERS) - 1)
+        elif mean < self.budget_ms * QUALITY_UPGRADE_AT:
+            self._calm_windows += 1
+            if self._calm_windows >= QUALITY_UPGRADE_WINDOWS:
+                self._calm_windows = 0
+                level = max(level - 1, 0)
+        else:
+            self._calm_windows = 0
+
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes += 1
+        return True
+
+    def apply(self, sim, renderer):
+        """Menerapkan tingkat saat ini ke sistem partikel simulasi dan renderer.
+
+        Murah, jadi aman dipanggil setiap frame (reset simulasi membuat sistem
+        partikel baru dengan skala default).
+        """
+        tier = self.tier
+        sim.particles.emission_scale = tier.particle_scale
+        sim.rain_particles.emission_scale = tier.rain_scale
+        renderer.cloud_scale = tier.cloud_scale
+        renderer.tree_detail = tier.tree_detail
+
+    def status(self):
+        """Ringkasan untuk UI/log: nama tingkat, indeks, mode, anggaran dan rata-rata terakhir."""
+        return {'tier': self.tier.name, 'level': self.level, 'adaptive': self.adaptive,
+                'budget_ms': self.budget_ms, 'mean_ms': self.last_mean_ms, 'changes': self.changes}
@@ -0,0 +1,589 @@
+"""Penggambaran simulasi dengan pygame.
+
+Renderer hanya membaca state DeforestationSimulation dan menyimpan semua cache
+visual (lapisan terrain, sprite pohon, tunggul, awan dan partikel) miliknya sendiri.
+Surface seukuran layar yang dipakai ulang setiap frame dikelola FrameBuffers.
+"""
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from colors import *
+from profiler import NullProfiler
+from simulation import SIM_SIZE, DROUGHT_RIVER_RADIUS, clamp
+
+TERRAIN_DROUGHT_LEVELS = 16 # Kuantisasi intensitas kekeringan untuk cache terrain
+PARTICLE_ALPHA_BITS = 4 # 16 bucket alpha untuk cache sprite partikel
+RAIN_STREAK_DX, RAIN_STREAK_DY = -10, 20 # Vektor garis miring satu tetes hujan
+TREE_HEALTH_LEVELS = 32 # Kuantisasi kesehatan pohon untuk atlas sprite
+TREE_VARIANTS = 2 # Varian bentuk per tingkat kesehatan (dasar dan cermin)
+TREE_ATLAS_CAPACITY = 256 # Jumlah maksimum sprite pohon di atlas (LRU)
+CLOUD_SPRITE_CAPACITY = 128 # Jumlah maksimum sprite awan yang di-cache (LRU)
+
+# ============ Utilitas Drawing ============
+def lerp_color(c1, c2, t):
+    t = clamp(t, 0, 1)
+    return (int(c1[0]+(c2[0]-c1[0])*t), int(c1[1]+(c2[1]-c1[1])*t), int(c1[2]+(c2[2]-c1[2])*t))
+
+def lerp_color_array(c1, c2, t):
+    """Versi vektor lerp_color: c1/c2 berupa warna atau array (..., 3), t skalar atau array."""
+    c1 = np.asarray(c1, dtype=np.float64)
+    c2 = np.asarray(c2, dtype=np.float64)
+    t = np.clip(t, 0, 1)
+    if np.ndim(t):
+        t = t[..., None]
+    return (c1 + (c2 - c1) * t).astype(np.uint8)
+
+_shadow_sprites = {}
+
+def shadow_sprite(w, h):
+    """Elips bayangan semi-transparan berukuran (w, h), dirender sekali per ukuran."""
+    s = _shadow_sprites.get((w, h))
+    if s is None:
+        s = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.ellipse(s, (0, 0, 0, 60), (0, 0, w, h))
+        _shadow_sprites[(w, h)] = s
+    return s
+
+def draw_shadow(surf, x, y, width, scale=1.0):
+    w = int(width * scale)
+    h = int(width * 0.25 * scale)
+    surf.blit(shadow_sprite(w, h), (x - w//2, y - h//2 + 5))
+
+
+# ============ Frame Buffer ============
+class FrameBuffers:
+    """Surface persisten untuk tampilan simulasi dan overlay-nya, dibuat sekali per nama.
+
+    Setelah display dibuka, surface dikonversi ke format display (convert) agar
+    blit tidak perlu konversi piksel. Overlay warna rata (kilat, badai) memakai
+    surface buram yang diisi sekali dengan alpha per-surface (set_alpha), sehingga
+    frame bencana dan hujan tidak mengalokasikan atau mengisi ulang surface penuh.
+    """
+    def __init__(self):
+        self.surfaces = {}
+
+    def get(self, name, size=(SIM_SIZE, SIM_SIZE), fill=None, colorkey=None):
+        surf = self.surfaces.get(name)
+        if surf is None or surf.get_size() != size:
+            surf = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            if fill is not None:
+                surf.fill(fill)
+            if colorkey is not None:
+                surf.set_colorkey(colorkey)
+            self.surfaces[name] = surf
+        return surf
+
+    def sim_view(self):
+        """Surface tempat satu frame simulasi digambar sebelum di-blit ke layar."""
+        return self.get('sim_view')
+
+    def overlay(self, name, color, alpha, size=(SIM_SIZE, SIM_SIZE)):
+        """Overlay seluas `size` berwarna `color` dengan opasitas `alpha` (0..255)."""
+        surf = self.get(name, size, fill=color)
+        surf.set_alpha(alpha)
+        return surf
+
+# ============ Renderer 2D ============
+class Renderer:
+    def __init__(self, sim, profiler=None, buffers=None):
+        self.sim = sim
+        self.buffers = buffers if buffers is not None else FrameBuffers()
+        # Setiap fase draw() diukur bila diberi FrameProfiler
+        self.profiler = profiler if profiler is not None else NullProfiler()
+
+        # Lapisan terrain yang di-cache; dibuat saat frame pertama
+        self.terrain_layer = None
+        self.full_redraw = True
+        self.terrain_drought_level = 0
+
+        self.particle_sprites = {}
+        self.tree_sprites = OrderedDict()
+        self.stump_sprites = {}
+        self.cloud_sprites = OrderedDict()
+        self.tree_order = None # (TreeStore, version, slot, posisi, varian) untuk draw_trees
+        self.tree_blits = None # (TreeStore, version, detail, [(sprite, topleft)]) untuk draw_trees
+
+        # Pengaturan kualitas (lihat quality.QualityGovernor)
+        self.tree_detail = 'full' # 'full', 'simple' atau 'dot'
+        self.cloud_scale = 1.0 # Bagian awan yang digambar
+
+    def draw(self, surface):
+        """Menggambar satu frame simulasi ke `surface` sesuai Z-order."""
+        phase = self.profiler.phase
+        # Z-Order Baru: Clouds di atas Trees/Stumps
+        with phase('terrain'):
+            self.draw_terrain(surface)   # 1. Base terrain and river
+            self.draw_lightning(surface) #    Lightning flash
+        with phase('stumps'):
+            self.draw_stumps(surface)    # 2. Stumps
+        with phase('trees'):
+            self.draw_trees(surface)     # 3. Trees (Canopy)
+        with phase('clouds'):
+            self.draw_clouds(surface)    # 4. Clouds (Di atas pohon, sesuai permintaan)
+        
+        # 5. Hujan/Badai (Overlay, di atas semuanya kecuali partikel)
+        with phase('rain_overlay'):
+            self.draw_rain_background(surface)
+
+        with phase('particles'):
+            self.draw_particles(surface, self.sim.particles)
+            self.draw_rain(surface, self.sim.rain_particles)
+
+    def draw_particles(self, surface, particles):
+        """Menggambar semua partikel dengan satu panggilan `Surface.blits`.
+
+        Setiap partikel dipetakan ke sprite lingkaran yang sudah dirender,
+        dikunci oleh (warna, radius, bucket alpha).
+        """
+        n = particles.count
+        if n == 0:
+            return
+        radius = particles.size[:n].astype(np.int64)
+        alpha = (255 * (1.0 - particles.age[:n] / particles.lifetime[:n])).astype(np.int64)
+        alpha = np.minimum(255, alpha + particles.color[:n, 3])
+        bucket = alpha >> (8 - PARTICLE_ALPHA_BITS)
+
+        rgb = particles.color[:n, :3].astype(np.int64)
+        keys = (((rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]) << 12) | (radius << PARTICLE_ALPHA_BITS) | bucket
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sprites = np.empty(unique_keys.size, dtype=object)
+        for k, key in enumerate(unique_keys.tolist()):
+            sprites[k] = self._particle_sprite(key)
+
+        topleft = (particles.pos[:n] - radius[:, None]).astype(np.int32)
+        surface.blits(zip(sprites[inverse].tolist(), topleft.tolist()), doreturn=False)
+
+    def _particle_sprite(self, key):
+        sprite = self.particle_sprites.get(key)
+        if sprite is None:
+            bucket = key & ((1 << PARTICLE_ALPHA_BITS) - 1)
+            radius = (key >> PARTICLE_ALPHA_BITS) & 0xFF
+            rgb = key >> 12
+            color = ((rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF,
+                     min(255, (bucket << (8 - PARTICLE_ALPHA_BITS)) + (1 << (7 - PARTICLE_ALPHA_BITS))))
+            size_int = radius * 2 + 1
+            sprite = pygame.Surface((size_int, size_int), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self.particle_sprites[key] = sprite
+        return sprite
+
+    def draw_rain(self, surface, rain):
+        """Partikel hujan digambar sebagai garis miring.
+
+        Semua garis ditulis langsung ke piksel satu lapisan (streak layer) yang
+        kemudian di-blit sekali ke layar.
+        """
+        n = rain.count
+        if n == 0:
+            return
+        size = surface.get_size()
+        layer = self.buffers.get('rain', size, colorkey=COLOR_BLACK)
+        layer.fill(COLOR_BLACK)
+
+        # Titik-titik sepanjang garis miring (satu piksel per langkah vertikal)
+        steps = np.arange(RAIN_STREAK_DY + 1, dtype=np.float32) / RAIN_STREAK_DY
+        xs = (rain.pos[:n, 0, None] + steps * RAIN_STREAK_DX).astype(np.int32).ravel()
+        ys = (rain.pos[:n, 1, None] + steps * RAIN_STREAK_DY).astype(np.int32).ravel()
+        inside = (xs >= 0) & (xs < size[0]) & (ys >= 0) & (ys < size[1])
+
+        pixels = pygame.surfarray.pixels2d(layer)
+        pixels[xs[inside], ys[inside]] = layer.map_rgb(COLOR_RAIN[:3])
+        del pixels
+        surface.blit(layer, (0, 0))
+
+    def _blit_cells_scaled(self, cells, layer, y0, y1, x0, x1):
+        """Memperbesar region sel [y0:y1, x0:x1] dari surface grid ke lapisan piksel.
+
+        Seluruh grid selalu diskalakan ke ukuran lapisan, termasuk grid yang lebih
+        besar dari SIM_SIZE atau yang tidak membaginya. Region sebagian hanya
+        dipakai bila setiap sel tepat cell_size piksel (lihat draw_terrain).
+        """
+        grid = self.sim.terrain_grid
+        if (y0, y1, x0, x1) == (0, grid, 0, grid):
+            pygame.transform.scale(cells, layer.get_size(), layer)
+            return
+        cs = self.sim.cell_size
+        src = cells.subsurface((x0, y0, x1 - x0, y1 - y0))
+        dst = layer.subsurface((x0 * cs, y0 * cs, (x1 - x0) * cs, (y1 - y0) * cs))
+        pygame.transform.scale(src, dst.get_size(), dst)
+
+    def _render_terrain_cells(self, y0, y1, x0, x1, drought_intensity):
+        sim = self.sim
+        colors = lerp_color_array(COLOR_DEFORESTED, COLOR_HEALTHY_GRASS, sim.vegetation_field(y0, y1, x0, x1))
+        if drought_intensity > 0:
+            colors = lerp_color_array(colors, COLOR_DRY, drought_intensity)
+
+        pixels = pygame.surfarray.pixels3d(self.terrain_cells)
+        pixels[x0:x1, y0:y1] = colors.transpose(1, 0, 2)
+        del pixels
+        self._blit_cells_scaled(self.terrain_cells, self.terrain_layer, y0, y1, x0, x1)
+
+    def draw_terrain(self, surface):
+        """Blit lapisan vegetasi yang di-cache, lalu gambar air animasi di atasnya.
+
+        Warna dihitung per region sebagai operasi array pada surface seukuran grid
+        lalu diperbesar ke ukuran piksel. Lapisan hanya dirender ulang pada sel yang
+        ditandai lewat mark_terrain_dirty, atau seluruhnya saat tingkat kekeringan
+        (dikuantisasi) berubah.
+        """
+        sim = self.sim
+        drought_active = sim.disaster_active and sim.disaster_type == 'drought'
+        drought_level = round(sim.disaster_visual_intensity * TERRAIN_DROUGHT_LEVELS) if drought_active else 0
+        grid = sim.terrain_grid
+
+        if self.terrain_layer is None:
+            self.terrain_layer = pygame.Surface((SIM_SIZE, SIM_SIZE))
+            self.terrain_cells = pygame.Surface((grid, grid))
+            self.water_layer = pygame.Surface((SIM_SIZE, SIM_SIZE))
+            self.water_layer.set_colorkey(COLOR_WATER_KEY)
+            self.water_cells = pygame.Surface((grid, grid))
+            self.full_redraw = True
+        if drought_level != self.terrain_drought_level:
+            self.terrain_drought_level = drought_level
+            self.full_redraw = True
+
+        drought_intensity = drought_level / TERRAIN_DROUGHT_LEVELS
+        # Sel yang tidak tepat cell_size piksel tidak bisa dirender per region;
+        # perubahan apa pun pada grid seperti itu merender ulang seluruh lapisan
+        exact_cells = grid * sim.cell_size == SIM_SIZE
+        if self.full_redraw or sim.terrain_full_redraw or (sim.terrain_dirty and not exact_cells):
+            self.terrain_layer.fill(COLOR_DEFORESTED)
+            self._render_terrain_cells(0, grid, 0, grid, drought_intensity)
+        else:
+            for y0, y1, x0, x1 in sim.terrain_dirty:
+                self._render_terrain_cells(y0, y1, x0, x1, drought_intensity)
+        self.full_redraw = False
+        sim.terrain_full_redraw = False
+        sim.terrain_dirty.clear()
+
+        surface.blit(self.terrain_layer, (0, 0))
+        self.draw_water(surface, drought_active)
+
+    def draw_water(self, surface, drought_active):
+        """Air dianimasikan setiap frame dan digambar di atas lapisan terrain yang di-cache."""
+        sim = self.sim
+        flood_visible = sim.disaster_active and sim.disaster_type in ['flood', 'landslide']
+        is_flooded = sim.flood_mask & flood_visible
+        water_cells = sim.river_mask | is_flooded
+        if not water_cells.any():
+            return
+
+        now = time.time()
+        jj, ii = np.nonzero(water_cells)
+        flooded = is_flooded[jj, ii]
+        colors = np.empty((jj.size, 3), dtype=np.float64)
+        colors[...] = COLOR_WATER
+        if flooded.any():
+            # Visual banjir yang lebih dinamis
+            t = np.sin(now * 3 + ii[flooded] + jj[flooded]) * 0.1 + 0.5
+            colors[flooded] = lerp_color_array(COLOR_FLOOD, (100, 150, 200), t)
+
+        wave_offset = 15 * np.sin(now * 5 + ii * 0.5 + jj * 0.3)
+        colors = np.trunc(colors + wave_offset[:, None] * 0.1)
+
+        if drought_active:
+            # Sungai kering menjadi tanah
+            dry = ~flooded & (sim.river_dist[jj, ii] > DROUGHT_RIVER_RADIUS)
+            colors[dry] = COLOR_DRY
+
+        self.water_cells.fill(COLOR_WATER_KEY)
+        pixels = pygame.surfarray.pixels3d(self.water_cells)
+        pixels[ii, jj] = colors.astype(np.uint8)
+        del pixels
+        self._blit_cells_scaled(self.water_cells, self.water_layer, 0, sim.terrain_grid, 0, sim.terrain_grid)
+        surface.blit(self.water_layer, (0, 0))
+
+    def draw_lightning(self, surface):
+        sim = self.sim
+        if sim.lightning_active > 0:
+            # Kilat: overlay putih terang
+            alpha = int(255 * (sim.lightning_active / 0.1))
+            surface.blit(self.buffers.overlay('flash', (255, 255, 255), alpha), (0, 0))
+
+    def draw_stumps(self, surface):
+        """Semua tunggul memakai satu sprite yang sama, digambar dengan satu `Surface.blits`."""
+        sim = self.sim
+        stump_gy, stump_gx = np.nonzero(sim.stump_map)
+        if stump_gx.size == 0:
+            return
+        sprite, ox, oy = self._stump_sprite()
+        stump_x, stump_y = sim.grid_to_pixel(stump_gx, stump_gy)
+        topleft = np.stack([stump_x - ox, stump_y - oy], axis=1).astype(np.int64)
+        surface.blits(zip([sprite] * len(topleft), topleft.tolist()), doreturn=False)
+
+    def _stump_sprite(self):
+        """Sprite tunggul (bayangan, batang, cincin) beserta titik jangkarnya, per ukuran sel."""
+        cell_size = self.sim.cell_size
+        entry = self.stump_sprites.get(cell_size)
+        if entry is not None:
+            return entry
+
+        scale = 0.5
+        stump_height = cell_size * 0.3 * scale
+        stump_width = cell_size * 0.5 * scale
+        shadow_w = int(stump_width * 2)
+        shadow_h = int(stump_width * 2 * 0.25)
+        half_w = max(shadow_w // 2, int(stump_width / 2)) + 2
+        top = int(stump_height) + 7
+        bottom = shadow_h + 7
+        sprite = pygame.Surface((half_w * 2 + 1, top + bottom + 1), pygame.SRCALPHA)
+        x, y = half_w, top
+
+        draw_shadow(sprite, x, y, stump_width * 2, scale=1.0)
+
+        trunk_rect = pygame.Rect(x - stump_width/2, y - stump_height, 
+                                 stump_width, stump_height)
+        pygame.draw.ellipse(sprite, (130, 90, 60), trunk_rect) 
+
+        top_rect = pygame.Rect(x - stump_width/2, y - stump_height - 5, 
+                               stump_width, stump_height * 0.5)
+        pygame.draw.ellipse(sprite, COLOR_STUMP_TOP, top_rect) 
+
+        for r in range(1, int(stump_width/4)):
+             pygame.draw.ellipse(sprite, (100, 60, 30), top_rect.inflate(-r*2, -r), 1)
+
+        entry = (sprite, half_w, top)
+        self.stump_sprites[cell_size] = entry
+        return entry
+
+    def draw_trees(self, surface):
+        """Menggambar semua pohon hidup dengan satu panggilan `Surface.blits`.
+
+        Daftar (sprite, posisi) dibangun oleh _tree_blits dan di-cache, jadi
+        frame tanpa perubahan pohon tidak melakukan kerja per pohon di Python.
+        """
+        if self.sim.trees.count == 0:
+            return
+        surface.blits(self._tree_blits(), doreturn=False)
+
+    def _tree_blits(self):
+        """Pasangan (sprite, topleft) setiap pohon dalam urutan gambar.
+
+        Setiap pohon dipetakan ke sprite dari atlas (lihat _tree_sprite) menurut
+        kesehatan yang dikuantisasi dan varian bentuknya. Hasilnya dihitung ulang
+        hanya saat TreeStore.version (pohon ditanam, ditebang, dilukai atau mati)
+        atau detail pohon berubah.
+        """
+        trees = self.sim.trees
+        detail = self.tree_detail
+        cached = self.tree_blits
+        if cached is not None and cached[0] is trees and cached[1] == trees.version and cached[2] == detail:
+            return cached[3]
+        order, base, variant = self._tree_draw_order()
+
+        level = np.rint(trees.health[order] * TREE_HEALTH_LEVELS).astype(np.int64)
+        keys = level * TREE_VARIANTS + variant
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sprites = np.empty(unique_keys.size, dtype=object)
+        anchors = np.empty((unique_keys.size, 2), dtype=np.int64)
+        for k, key in enumerate(unique_keys.tolist()):
+            sprites[k], anchors[k, 0], anchors[k, 1] = self._tree_sprite(*divmod(key, TREE_VARIANTS))
+
+        topleft = base - anchors[inverse]
+        blits = list(zip(sprites[inverse].tolist(), topleft.tolist()))
+        self.tree_blits = (trees, trees.version, detail, blits)
+        return blits
+
+    def _tree_draw_order(self):
+        """Slot pohon hidup dalam urutan gambar, beserta posisi piksel dan variannya.
+
+        Urutan diambil dari cell_index secara row-major (baris grid = posisi y,
+        lalu x), jadi tidak perlu sorting. Hasilnya di-cache dan hanya dihitung
+        ulang saat TreeStore.version berubah (lihat TreeStore).
+        """
+        trees = self.sim.trees
+        if self.tree_order is None or self.tree_order[0] is not trees or self.tree_order[1] != trees.version:
+            order = trees.cell_index.ravel()
+            order = order[order >= 0]
+            gx, gy = trees.gx[order], trees.gy[order]
+            tree_x, tree_y = self.sim.grid_to_pixel(gx, gy)
+            base = np.stack([tree_x, tree_y], axis=1).astype(np.int64)
+            variant = (gx * 7 + gy * 13) % TREE_VARIANTS
+            self.tree_order = (trees, trees.version, order, base, variant)
+        return self.tree_order[2:]
+
+    def _tree_sprite(self, level, variant):
+        """Sprite pohon (bayangan, batang, kanopi, bar kesehatan) beserta titik jangkarnya.
+
+        Atlas dikunci oleh (ukuran sel, detail, tingkat kesehatan, varian) dan
+        dibatasi TREE_ATLAS_CAPACITY sprite; sprite yang paling lama tidak dipakai
+        dibuang. Varian ganjil adalah cerminan horizontal dari varian dasar.
+        Detail 'simple' hanya batang dan satu lingkaran kanopi; 'dot' adalah
+        kotak buram seukuran kanopi yang paling murah di-blit.
+        """
+        detail = self.tree_detail
+        key = (self.sim.cell_size, detail, level, variant)
+        entry = self.tree_sprites.get(key)
+        if entry is not None:
+            self.tree_sprites.move_to_end(key)
+            return entry
+
+        cell_size = self.sim.cell_size
+        health = level / TREE_HEALTH_LEVELS
+        scale = 0.5 + health * 0.5
+        radius_base = cell_size * 0.7 * scale
+        trunk_height = cell_size * 0.8 * scale
+        if detail == 'dot':
+            side = max(2, int(radius_base))
+            sprite = pygame.Surface((side, side))
+            sprite.fill(lerp_color(COLOR_DRY, COLOR_CANOPY_BASE, health / 0.5))
+            entry = (sprite, side // 2, side // 2 + int(trunk_height))
+        else:
+            # Batas sprite mencakup kanopi (hingga 1.2 radius) dan bayangan; ruang bar
+            # kesehatan hanya untuk tingkat yang menggambarnya, agar pohon sehat tetap kecil
+            health_bar = detail == 'full' and health < 0.8
+            half_w = int(max(radius_base * 1.2, 15 * scale if health_bar else 0)) + 2
+            top = int(trunk_height + max(radius_base * 1.3, 10 if health_bar else 0)) + 2
+            bottom = int(radius_base * 0.2) + 8
+            sprite = pygame.Surface((half_w * 2 + 1, top + bottom + 1), pygame.SRCALPHA)
+            self._render_tree(sprite, half_w, top, health, detail)
+            if variant % 2:
+                sprite = pygame.transform.flip(sprite, True, False)
+            # Bar kesehatan tidak ikut dicerminkan agar selalu terisi dari kiri
+            if health_bar:
+                self._draw_health_bar(sprite, half_w, top, health)
+            entry = (sprite, half_w, top)
+
+        self.tree_sprites[key] = entry
+        if len(self.tree_sprites) > TREE_ATLAS_CAPACITY:
+            self.tree_sprites.popitem(last=False)
+        return entry
+
+    def _render_tree(self, surface, x, y, health, detail='full'):
+        """Menggambar satu pohon (tanpa bar kesehatan) dengan pangkal batang di (x, y)."""
+        sim = self.sim
+        scale = 0.5 + health * 0.5
+
+        radius_base = sim.cell_size * 0.7 * scale
+        trunk_height = sim.cell_size * 0.8 * scale
+        trunk_width = sim.cell_size * 0.25 * scale
+
+        # Basis untuk variasi warna (hijau yang lebih gelap dan lebih terang)
+        DARK_GREEN = (20, 80, 30)
+        LIGHT_GREEN = (50, 150, 60)
+
+        if detail == 'full':
+            draw_shadow(surface, x, y, radius_base * 1.5)
+
+        trunk_col = (120, 80, 40)
+        tw_b, tw_t, th = trunk_width, trunk_width * 0.5, trunk_height
+        pygame.draw.polygon(surface, trunk_col, [
+            (x - tw_b / 2, y), 
+            (x + tw_b / 2, y), 
+            (x + tw_t / 2, y - th), 
+            (x - tw_t / 2, y - th)
+        ])
+        
+        if health < 0.5:
+            t = health / 0.5 
+            canopy_color_base = lerp_color(COLOR_DRY, COLOR_CANOPY_BASE, t)
+        else:
+            canopy_color_base = COLOR_CANOPY_BASE
+        
+        canopy_y = int(y - trunk_height) 
+        radius = int(radius_base)
+        
+        # --- Perubahan untuk Dimensi Warna Stabil ---
+        # Pola lapisan (semakin besar radius, semakin terang/cerah)
+        layer_config = [
+            # Lapisan Bawah (Paling gelap, paling besar)
+            (0, 0, 1.0, 0.0), 
+            # Lapisan Tengah-Bawah (Sedikit lebih terang)
+            (-0.4, -0.3, 0.7, 0.2), 
+            # Lapisan Tengah-Atas (Sedang)
+            (0.4, -0.3, 0.7, 0.1), 
+            # Lapisan Atas (Paling cerah, paling kecil)
+            (-0.1, -0.6, 0.6, 0.4), 
+            (0.3, -0.7, 0.5, 0.3)
+        ]
+        
+        if detail != 'full':
+            layer_config = layer_config[:1]
+
+        for dx, dy, r_scale, t_lerp in layer_config:
+            r = int(radius * r_scale)
+            cx = int(x + dx * radius)
+            cy = int(canopy_y + dy * radius)
+            
+            # Interpolasi warna berdasarkan t_lerp untuk variasi dimensi:
+            # Warna bervariasi antara DARK_GREEN dan LIGHT_GREEN, tergantung posisi lapisan
+            
+            # Ciptakan warna hijau yang bervariasi, berdasarkan canopy_color_base
+            mixed_green = (
+                int(canopy_color_base[0] * (1 - t_lerp) + LIGHT_GREEN[0] * t_lerp),
+                int(canopy_color_base[1] * (1 - t_lerp) + LIGHT_GREEN[1] * t_lerp),
+                int(canopy_color_base[2] * (1 - t_lerp) + LIGHT_GREEN[2] * t_lerp)
+            )
+
+            # Clamp untuk memastikan nilai RGB tetap valid
+            layer_color = (
+                clamp(mixed_green[0], DARK_GREEN[0], LIGHT_GREEN[0]),
+                clamp(mixed_green[1], DARK_GREEN[1], LIGHT_GREEN[1]),
+                clamp(mixed_green[2], DARK_GREEN[2], LIGHT_GREEN[2])
+            )
+            
+            pygame.draw.circle(surface, layer_color, (cx, cy), r)
+
+    def _draw_health_bar(self, surface, x, y, health):
+        """Bar kesehatan di atas kanopi pohon yang pangkal batangnya di (x, y)."""
+        if health < 0.8:
+            scale = 0.5 + health * 0.5
+            trunk_height = self.sim.cell_size * 0.8 * scale
+            bar_w, bar_h = 30 * scale, 4 
+            bar_x, bar_y = x - bar_w//2, y - trunk_height - 10
+            pygame.draw.rect(surface, (100, 0, 0), (bar_x, bar_y, bar_w, bar_h))
+            pygame.draw.rect(surface, (0, 255, 0), (bar_x, bar_y, bar_w * health, bar_h))
+
+    def draw_clouds(self, surface):
+        """Menggambar awan tipis yang bergerak, lapisan terjauh lebih dulu, dengan satu `Surface.blits`."""
+        sim = self.sim
+        # Ganti warna awan saat hujan menjadi gelap
+        color = COLOR_STORM_CLOUD if sim.is_raining else (200, 200, 200, 150)
+        # cloud_scale < 1 (kualitas rendah) menyembunyikan awan tambahan lebih dulu
+        visible = sim.clouds[:math.ceil(len(sim.clouds) * self.cloud_scale)]
+        clouds = sorted(visible, key=lambda cloud: -cloud.layer)
+        surface.blits([(self._cloud_sprite(cloud, color), (cloud.x - cloud.width / 2, cloud.y - cloud.height / 2))
+                       for cloud in clouds], doreturn=False)
+
+    def _cloud_sprite(self, cloud, color):
+        """Bentuk awan yang sudah dirender, dikunci oleh (ukuran dibulatkan, lapisan, warna).
+
+        Kunci baru hanya muncul saat awan muncul kembali dengan ukuran baru atau
+        cuaca berganti; sprite lama dibuang secara LRU.
+        """
+        key = (round(cloud.size), cloud.layer, color)
+        sprite = self.cloud_sprites.get(key)
+        if sprite is not None:
+            self.cloud_sprites.move_to_end(key)
+            return sprite
+
+        width, height = key[0] * 2, key[0] * 0.8
+        if cloud.layer:
+            color = color[:3] + (int(color[3] * cloud.depth_scale),)
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        
+        # Gambar bentuk awan. Menghapus 'border_radius' karena tidak didukung oleh ellipse.
+        pygame.draw.ellipse(sprite, color, (0, 0, width, height))
+        pygame.draw.circle(sprite, color, (int(width * 0.25), int(height * 0.5)), int(height * 0.7))
+        pygame.draw.circle(sprite, color, (int(width * 0.75), int(height * 0.6)), int(height * 0.8))
+
+        self.cloud_sprites[key] = sprite
+        if len(self.cloud_sprites) > CLOUD_SPRITE_CAPACITY:
+            self.cloud_sprites.popitem(last=False)
+        return sprite
+
+    def draw_rain_background(self, surface):
+        """Menggambar lapisan latar belakang hujan/badai."""
+        sim = self.sim
+        if sim.is_raining:
+            # Lapisan gelap untuk menunjukkan badai
+            alpha_dark = int(100 * (sim.rain_timer / sim.rain_duration)) 
+            surface.blit(self.buffers.overlay('storm', (0, 0, 0), alpha_dark), (0, 0))
+
+        # Partikel hujan dan awan digambar setelah ini
@@ -0,0 +1,208 @@
+"""Log event input pengguna dan replay deterministik.
+
+Setiap aksi pengguna (tanam, tebang, tebang massal, reset) dicatat sebagai
+rekaman biner berukuran tetap beserta tick saat aksi terjadi. Karena
+simulasi ber-seed dan berjalan dengan tick tetap, menerapkan ulang event
+yang sama pada tick yang sama merekonstruksi sesi secara persis, tanpa
+layar. Keyframe (snapshot dalam memori) memungkinkan seek ke tick N tanpa
+mengulang dari awal.
+"""
+import argparse
+import bisect
+import dataclasses
+import json
+import struct
+import time
+
+import numpy as np
+
+from simulation import DeforestationSimulation, SimulationConfig
+from snapshot import restore_bytes, save_snapshot, snapshot_bytes
+
+LOG_MAGIC = b'DEFLOG\x00\x00'
+LOG_VERSION = 1
+_HEADER = struct.Struct('<8sII')
+KEYFRAME_INTERVAL = 3600 # Tick antar keyframe (1 menit simulasi)
+
+EVENT_PLANT = 1 # a, b = gx, gy
+EVENT_CUT = 2 # a, b = piksel x, y
+EVENT_MASS_CUT = 3
+EVENT_RESET = 4
+EVENT_QUIT = 5 # Penanda akhir sesi
+EVENT_NAMES = {EVENT_PLANT: 'plant', EVENT_CUT: 'cut', EVENT_MASS_CUT: 'mass_cut',
+               EVENT_RESET: 'reset', EVENT_QUIT: 'quit'}
+
+EVENT_DTYPE = np.dtype([('tick', '<u4'), ('kind', 'u1'), ('a', '<i4'), ('b', '<i4')])
+
+class LogError(ValueError):
+    pass
+
+def apply_event(sim, kind, a=0, b=0):
+    """Menerapkan satu aksi pengguna ke simulasi (dipakai App maupun replay)."""
+    if kind == EVENT_PLANT:
+        sim.add_tree_by_grid(a, b)
+    elif kind == EVENT_CUT:
+        sim.remove_tree_by_pixel(a, b)
+    elif kind == EVENT_MASS_CUT:
+        sim.remove_20_percent_trees()
+    elif kind == EVENT_RESET:
+        sim.reset_simulation()
+
+# ============ Log Event ============
+class EventLog:
+    """Log event append-only: array terstruktur di memori, opsional disalin ke file.
+
+    File terdiri dari header (magic, versi, panjang metadata), metadata JSON
+    (grid, seed, config) lalu rekaman EVENT_DTYPE 13 byte secara berurutan.
+    """
+    def __init__(self, terrain_grid, seed, config=None, path=None, capacity=256):
+        if seed is None:
+            raise LogError("Replay membutuhkan simulasi dengan seed tetap")
+        self.terrain_grid = terrain_grid
+        self.seed = seed
+        self.config = config if config is not None else SimulationConfig()
+        self.events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.count = 0
+        self._file = None
+        if path is not None:
+            self._file = open(path, 'wb')
+            meta = json.dumps(self._meta()).encode('utf-8')
+            self._file.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, len(meta)))
+            self._file.write(meta)
+            self._file.flush()
+
+    @classmethod
+    def for_simulation(cls, sim, path=None):
+        return cls(sim.terrain_grid, sim.seed, sim.config, path=path)
+
+    def _meta(self):
+        return {'terrain_grid': self.terrain_grid, 'seed': self.seed,
+                'config': dataclasses.asdict(self.config)}
+
+    def __len__(self):
+        return self.count
+
+    def record(self, tick, kind, a=0, b=0):
+        if self.count == self.events.size:
+            self.events = np.concatenate([self.events, np.zeros_like(self.events)])
+        if self.count and tick < self.events['tick'][self.count - 1]:
+            raise LogError("Event harus dicatat dengan tick yang tidak menurun")
+        rec = self.events[self.count:self.count + 1]
+        rec[0] = (tick, kind, a, b)
+        self.count += 1
+        if self._file is not None:
+            # Aksi pengguna jarang, jadi setiap rekaman langsung di-flush ke disk
+            self._file.write(rec.tobytes())
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            magic, version, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != LOG_MAGIC:
+                raise LogError("Bukan file log event simulasi deforestasi")
+            if version != LOG_VERSION:
+                raise LogError(f"Versi log {version} tidak didukung (diharapkan {LOG_VERSION})")
+            meta = json.loads(f.read(meta_len))
+            data = f.read()
+        # Rekaman terakhir yang terpotong (program berhenti saat menulis) diabaikan
+        n = len(data) // EVENT_DTYPE.itemsize
+        log = cls(meta['terrain_grid'], meta['seed'], SimulationConfig(**meta['config']), capacity=max(n, 1))
+        log.events[:n] = np.frombuffer(data, dtype=EVENT_DTYPE, count=n)
+        log.count = n
+        return log
+
+    @property
+    def ticks(self):
+        return self.events['tick'][:self.count]
+
+    @property
+    def last_tick(self):
+        return int(self.events['tick'][self.count - 1]) if self.count else 0
+
+# ============ Replay ============
+class ReplayEngine:
+    """Merekonstruksi state simulasi pada tick mana pun dari EventLog.
+
+    State "pada tick N" adalah state setelah N tick dengan semua event bercap
+    tick <= N sudah diterapkan, yaitu yang dilihat pengguna pada frame itu.
+    Keyframe disimpan sebelum event pada tick-nya diterapkan, setiap
+    `keyframe_interval` tick yang dilewati replay.
+    """
+    def __init__(self, log, keyframe_interval=KEYFRAME_INTERVAL):
+        self.log = log
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {}
+        self._keyframe_ticks = []
+
+    def _initial(self):
+        return DeforestationSimulation(self.log.terrain_grid, seed=self.log.seed, config=self.log.config)
+
+    def _store_keyframe(self, sim):
+        tick = sim.tick_count
+        if tick not in self.keyframes:
+            self.keyframes[tick] = snapshot_bytes(sim)
+            bisect.insort(self._keyframe_ticks, tick)
+
+    def seek(self, tick):
+        """Mengembalikan simulasi baru pada `tick`, dimulai dari keyframe terdekat."""
+        k = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        if k >= 0:
+            sim = restore_bytes(self.keyframes[self._keyframe_ticks[k]])
+        else:
+            sim = self._initial()
+        return self._run(sim, tick)
+
+    def run_to_end(self):
+        return self.seek(self.log.last_tick)
+
+    def _run(self, sim, target):
+        ticks = self.log.ticks
+        kinds = self.log.events['kind']
+        a = self.log.events['a']
+        b = self.log.events['b']
+        interval = self.keyframe_interval
+        i = int(np.searchsorted(ticks, sim.tick_count, side='left'))
+
+        while True:
+            now = sim.tick_count
+            if interval and now % interval == 0:
+                self._store_keyframe(sim)
+            while i < len(ticks) and ticks[i] == now:
+                apply_event(sim, int(kinds[i]), int(a[i]), int(b[i]))
+                i += 1
+            if now >= target:
+                return sim
+            next_stop = target
+            if i < len(ticks):
+                next_stop = min(next_stop, int(ticks[i]))
+            if interval:
+                next_stop = min(next_stop, (now // interval + 1) * interval)
+            sim.step(next_stop - now)
+
+# ============ Main Execution ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay headless log event simulasi deforestasi")
+    parser.add_argument('log', help="File log event dari main.py --record")
+    parser.add_argument('--tick', type=int, default=None, help="Tick tujuan (default: akhir sesi)")
+    parser.add_argument('--save', default=None, help="Simpan state hasil replay sebagai snapshot")
+    args = parser.parse_args()
+
+    log = EventLog.load(args.log)
+    engine = ReplayEngine(log)
+    target = log.last_tick if args.tick is None else args.tick
+    start = time.perf_counter()
+    sim = engine.seek(target)
+    elapsed = time.perf_counter() - start
+    print(f"Replay {len(log)} event hingga tick {sim.tick_count} dalam {elapsed:.2f} s "
+          f"({sim.tick_count / max(elapsed, 1e-9):.0f} tick/detik)")
+    print(f"Pohon: {len(sim.trees)}, tunggul: {sim.stump_count}, risiko erosi: {sim.erosion_risk:.3f}, "
+          f"bencana: {sim.total_disasters}")
+    if args.save:
+        save_snapshot(sim, args.save)
+        print(f"Snapshot disimpan ke {args.save}")
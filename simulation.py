@@ -0,0 +1,938 @@
+"""Inti simulasi deforestasi: model grid, pohon, partikel, dan bencana.
+
+Modul ini hanya bergantung pada NumPy dan pustaka standar sehingga bisa
+dijalankan tanpa layar (batch, benchmark, eksperimen). Penggambaran ada di
+renderer.py dan antarmuka di ui.py.
+"""
+import logging
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from colors import COLOR_RAIN, COLOR_SOIL
+
+# Pesan peristiwa (bencana, penebangan massal) dilaporkan lewat logging level INFO;
+# main.py menampilkannya di konsol, sedangkan run headless tetap senyap
+log = logging.getLogger(__name__)
+
+# ============ Pengaturan Simulasi ============
+SIM_SIZE = 600
+DROUGHT_RIVER_RADIUS = 0.5 # Lebar sungai (dari garis tengah) saat kekeringan
+MASS_CUT_FRACTION = 0.20 # Bagian pohon yang ditebang oleh tombol penebangan massal
+MAX_DEBRIS_PER_BATCH = 20000 # Batas partikel debris per satu panggilan efek
+TICK_MS = 1000.0 / 60 # Langkah waktu tetap satu tick simulasi
+MAX_TICKS_PER_ADVANCE = 5 # Batas tick per frame agar frame lambat tidak menumpuk (spiral of death)
+DEFAULT_CLOUDS = 5 # 5 awan utama; awan tambahan tersebar di lapisan parallax yang lebih jauh
+CLOUD_LAYERS = 3 # Lapisan langit parallax (0 = terdekat)
+CLOUD_PARALLAX = 0.6 # Skala ukuran/kecepatan/opasitas per lapisan lebih jauh
+
+# ============ Parameter Model ============
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Ambang batas dan laju bencana/erosi yang dipakai DeforestationSimulation.
+
+    Immutable dan hashable sehingga bisa dipakai sebagai kunci cache sweep.
+    Probabilitas bencana dihitung per tick (TICK_MS).
+    """
+    # Risiko erosi -> tingkat peringatan 0..3
+    warning_low: float = 0.3
+    warning_moderate: float = 0.5
+    warning_high: float = 0.7
+    # Risiko minimum untuk jenis bencana basah (longsor/banjir) dan kering (gempa/kekeringan)
+    disaster_risk_moderate: float = 0.5
+    disaster_risk_high: float = 0.7
+    disaster_prob_moderate: float = 0.001
+    disaster_prob_high: float = 0.005
+    disaster_cooldown: float = 10.0 # detik
+    disaster_duration_min: float = 5.0 # detik
+    disaster_duration_max: float = 8.0
+    rain_duration: float = 5.0 # detik hujan sebelum bencana basah aktif
+    lightning_prob: float = 0.005
+    rain_spawn_prob: float = 0.8
+
+    landslide_radius: int = 4
+    landslide_flood_radius: float = 1.0
+    flood_radius: float = 5.0
+    flood_erosion_factor: float = 3.0 # Tambahan radius banjir pada risiko erosi 1.0
+    flood_stray_prob: float = 0.05 # Peluang pohon di luar genangan ikut rusak
+    flood_health_factor: float = 0.7
+    flood_map_decay: float = 0.90
+    earthquake_kill_prob: float = 0.2
+    drought_hit_prob: float = 0.4
+    drought_health_factor: float = 0.6
+    drought_map_decay: float = 0.85
+    dead_health: float = 0.15 # Pohon dengan kesehatan di bawah ini mati
+
+    @property
+    def max_flood_radius(self):
+        """Radius banjir terbesar yang mungkin, dalam sel grid."""
+        return max(self.flood_radius, self.landslide_flood_radius) + self.flood_erosion_factor
+
+# ============ Utilitas ============
+def clamp(v, a, b): return max(a, min(b, v))
+
+def smooth_noise(x, seed=12345):
+    """Interpolasi cosinus sederhana untuk nilai noise yang halus."""
+    t = x % 1
+    t = t * t * (3 - 2 * t)
+    
+    # Fungsi hash sederhana
+    def hash_func(val):
+        return (val * 15731 + seed + 1376312589) & 0x7fffffff
+
+    n0 = hash_func(int(x)) 
+    n1 = hash_func(int(x) + 1)
+    
+    # Normalisasi ke [0, 1]
+    val0 = (n0 / 2147483647.0) 
+    val1 = (n1 / 2147483647.0)
+
+    return val0 * (1 - t) + val1 * t
+
+def distance_transform(mask, max_distance):
+    """Jarak Euclidean eksak dari tiap sel ke sel True terdekat pada `mask`.
+
+    Lintasan pertama menghitung jarak vertikal per kolom dengan akumulasi indeks,
+    lintasan kedua mengambil minimum (g^2 + dx^2) untuk |dx| <= max_distance.
+    Sel yang lebih jauh dari max_distance bernilai inf.
+    """
+    h, w = mask.shape
+    rows = np.arange(h, dtype=np.float32)[:, None]
+
+    above = np.where(mask, rows, np.float32(-np.inf))
+    np.maximum.accumulate(above, axis=0, out=above)
+    below = np.where(mask, rows, np.float32(np.inf))[::-1]
+    below = np.minimum.accumulate(below, axis=0)[::-1]
+    g = np.minimum(rows - above, below - rows)
+
+    d2 = g * g
+    out = d2.copy()
+    for dx in range(1, min(int(max_distance), w - 1) + 1):
+        off = np.float32(dx * dx)
+        np.minimum(out[:, dx:], d2[:, :-dx] + off, out=out[:, dx:])
+        np.minimum(out[:, :-dx], d2[:, dx:] + off, out=out[:, :-dx])
+
+    np.sqrt(out, out=out)
+    out[out > max_distance] = np.inf
+    return out
+
+# ============ Sistem Partikel 2D (Structure-of-Arrays) ============
+class ParticleSystem:
+    """Kumpulan partikel yang disimpan dalam array NumPy kontigu.
+
+    Slot hidup selalu berada di indeks [0, count); partikel yang habis umurnya
+    dipadatkan ke depan setiap update sehingga integrasi cukup satu operasi vektor.
+    """
+    def __init__(self, capacity=1024, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        # Bagian partikel yang benar-benar disimpan saat emit (diatur pengatur kualitas)
+        self.emission_scale = 1.0
+        self._emit_credit = 0.0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        # RGB + alpha tambahan (0 untuk warna tanpa alpha)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+
+    def _reserve(self, needed):
+        if needed <= self.capacity:
+            return
+        n = self.count
+        old = (self.pos, self.vel, self.age, self.lifetime, self.size, self.gravity, self.color)
+        self._allocate(max(needed, self.capacity * 2))
+        new = (self.pos, self.vel, self.age, self.lifetime, self.size, self.gravity, self.color)
+        for src, dst in zip(old, new):
+            dst[:n] = src[:n]
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x, y, color, count=1, lifetime=(0.5, 1.5), size_range=(2, 5),
+             vel_x=(-50, 50), vel_y=(-150, -80), gravity=300.0, spread=0.0):
+        """Menambahkan `count` partikel untuk setiap titik asal (x, y skalar atau array).
+
+        Dengan emission_scale < 1 hanya sebagian partikel (tersebar merata) yang
+        disimpan. Bilangan acak tetap dibangkitkan untuk semua partikel, sehingga
+        aliran RNG simulasi tidak bergantung pada tingkat kualitas.
+        """
+        x, y = np.broadcast_arrays(np.atleast_1d(np.asarray(x, dtype=np.float32)),
+                                   np.atleast_1d(np.asarray(y, dtype=np.float32)))
+        n = x.size * count
+        if n <= 0:
+            return
+
+        # Satu blok bilangan acak [0, 1) untuk semua atribut, lalu diskalakan per kolom
+        u = self.rng.random((6, n), dtype=np.float32)
+        x, y = np.repeat(x, count), np.repeat(y, count)
+        if self.emission_scale < 1.0:
+            # Sisa pecahan dibawa ke emit berikutnya agar emisi satu per satu (hujan) ikut terskala
+            self._emit_credit += n * self.emission_scale
+            keep = int(self._emit_credit)
+            self._emit_credit -= keep
+            if keep == 0:
+                return
+            picked = np.arange(keep) * n // keep
+            u, x, y, n = u[:, picked], x[picked], y[picked], keep
+
+        self._reserve(self.count + n)
+        s = slice(self.count, self.count + n)
+        self.pos[s, 0] = x + spread * (2 * u[0] - 1)
+        self.pos[s, 1] = y + spread * (2 * u[1] - 1)
+        self.vel[s, 0] = vel_x[0] + (vel_x[1] - vel_x[0]) * u[2]
+        self.vel[s, 1] = vel_y[0] + (vel_y[1] - vel_y[0]) * u[3]
+        self.age[s] = 0.0
+        self.lifetime[s] = lifetime[0] + (lifetime[1] - lifetime[0]) * u[4]
+        self.size[s] = size_range[0] + (size_range[1] - size_range[0]) * u[5]
+        self.gravity[s] = gravity
+        self.color[s, :3] = color[:3]
+        self.color[s, 3] = color[3] if len(color) == 4 else 0
+        self.count += n
+
+    def update(self, dt_ms):
+        n = self.count
+        if n == 0:
+            return
+        dt = dt_ms / 1000.0
+
+        age = self.age[:n]
+        age += dt
+        vel = self.vel[:n]
+        vel[:, 1] += self.gravity[:n] * dt
+        self.pos[:n] += vel * dt
+
+        alive = age < self.lifetime[:n]
+        if not alive.all():
+            self._compact(alive)
+
+    def _compact(self, alive):
+        """Mengisi slot mati di depan dengan partikel hidup dari ekor array.
+
+        Hanya slot yang berubah yang disalin, jadi biayanya sebanding dengan
+        jumlah partikel yang mati, bukan jumlah total partikel.
+        """
+        k = int(np.count_nonzero(alive))
+        holes = np.flatnonzero(~alive[:k])
+        if holes.size:
+            movers = np.flatnonzero(alive[k:]) + k
+            for arr in (self.pos, self.vel, self.age, self.lifetime, self.size, self.gravity, self.color):
+                arr[holes] = arr[movers]
+        self.count = k
+
+
+class Cloud:
+    """Satu awan yang bergerak ke kanan dan muncul kembali di kiri.
+
+    `layer` 0 adalah lapisan terdekat; awan di lapisan lebih jauh lebih kecil,
+    lebih lambat dan (di renderer) lebih transparan sebesar depth_scale.
+    """
+    def __init__(self, x, y, size, speed, color, rng, layer=0):
+        self.rng = rng
+        self.x = x
+        self.y = y
+        self.size = size
+        self.speed = speed
+        self.color = color
+        self.layer = layer
+        self.width = self.size * 2
+        self.height = self.size * 0.8
+
+    @property
+    def depth_scale(self):
+        return CLOUD_PARALLAX ** self.layer
+    
+    def update(self, dt_ms):
+        dt = dt_ms / 1000.0
+        self.x += self.speed * dt
+        if self.x > SIM_SIZE + self.width:
+            self.x = -self.width
+            self.y = self.rng.uniform(0, SIM_SIZE * 0.2)
+            self.size = self.rng.uniform(50, 150) * self.depth_scale
+            self.width = self.size * 2
+            self.height = self.size * 0.8
+
+# ============ Penyimpanan Pohon Kolumnar ============
+class TreeStore:
+    """Pohon disimpan sebagai kolom array NumPy (bukan dict per pohon).
+
+    Setiap pohon menempati satu slot; slot yang dilepas masuk free-list dan
+    dipakai ulang. `cell_index` memetakan sel grid ke slot (-1 = kosong) untuk
+    cek okupansi O(1). `version` bertambah setiap kali pohon ditambah, dilepas
+    atau dilukai, sehingga cache turunan (misalnya sprite gambar) tahu kapan basi.
+    """
+    def __init__(self, grid_size, capacity=256):
+        self.cell_index = np.full((grid_size, grid_size), -1, dtype=np.int32)
+        self.gx = np.zeros(capacity, dtype=np.int32)
+        self.gy = np.zeros(capacity, dtype=np.int32)
+        self.health = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.dying = np.zeros(capacity, dtype=bool)
+        self.size = 0 # Jumlah slot yang pernah dipakai (batas atas indeks)
+        self.count = 0 # Jumlah pohon hidup
+        self.free = []
+        self.version = 0
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = self.gx.size * 2
+        for name in ('gx', 'gy', 'health', 'alive', 'dying'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:old.size] = old
+            setattr(self, name, new)
+
+    def add(self, gx, gy):
+        """Menanam pohon sehat di (gx, gy); mengembalikan slot, atau -1 jika sel terisi."""
+        if self.cell_index[gy, gx] >= 0:
+            return -1
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == self.gx.size:
+                self._grow()
+            slot = self.size
+            self.size += 1
+
+        self.gx[slot] = gx
+        self.gy[slot] = gy
+        self.health[slot] = 1.0
+        self.alive[slot] = True
+        self.dying[slot] = False
+        self.cell_index[gy, gx] = slot
+        self.count += 1
+        self.version += 1
+        return slot
+
+    def remove(self, slots):
+        """Melepas satu slot atau array slot pohon hidup."""
+        slots = np.atleast_1d(slots)
+        self.alive[slots] = False
+        self.dying[slots] = False
+        self.cell_index[self.gy[slots], self.gx[slots]] = -1
+        self.free.extend(slots.tolist())
+        self.count -= slots.size
+        self.version += 1
+
+    def damage(self, slots, factor):
+        """Mengalikan kesehatan pohon pada array slot dengan `factor` dan menandainya sekarat."""
+        if slots.size == 0:
+            return
+        self.health[slots] *= factor
+        self.dying[slots] = True
+        self.version += 1
+
+    def alive_slots(self):
+        return np.flatnonzero(self.alive[:self.size])
+
+# ============ Kelas Utama Simulasi 2D ============
+class DeforestationSimulation:
+    def __init__(self, terrain_grid=20, seed=None, config=None):
+        self.terrain_grid = terrain_grid
+        self.config = config if config is not None else SimulationConfig()
+        self.cell_size = max(1, SIM_SIZE // self.terrain_grid)
+        # Semua keacakan simulasi berasal dari satu Generator per instance;
+        # seed yang sama menghasilkan jalannya simulasi yang identik
+        self.seed = seed
+        # Jam tick sesi; tidak diulang oleh reset agar cap waktu event tetap monoton
+        self.tick_count = 0
+        self.time_accumulator = 0.0
+        
+        # States untuk visual bencana
+        self.quake_offset_x = 0
+        self.quake_offset_y = 0
+        self.lightning_active = 0.0 # Durasi kilat
+        # Jumlah awan adalah pengaturan tampilan, bukan parameter simulasi (lihat init_clouds)
+        self.cloud_count = DEFAULT_CLOUDS
+        
+        self.initialize_state()
+        log.info("Simulasi Deforestasi 2D dengan gaya halus telah diinisialisasi.")
+        
+    def initialize_state(self):
+        """Mengatur ulang semua variabel simulasi ke kondisi awal."""
+        self.rng = np.random.default_rng(self.seed)
+        self.deforestation_map = np.ones((self.terrain_grid, self.terrain_grid)) * 0.9 
+        self.erosion_risk = 0.0
+        self.warning_level = 0
+        # Jumlah tutupan vegetasi di sel darat, diperbarui inkremental setiap sel berubah
+        self.coverage_sum = 0.0
+        self.land_area = 0
+        self.particles = ParticleSystem(capacity=4096, rng=self.rng)
+        self.rain_particles = ParticleSystem(capacity=1024, rng=self.rng)
+        # Pohon disimpan kolumnar dengan indeks per sel; tunggul sebagai peta okupansi
+        self.trees = TreeStore(self.terrain_grid)
+        self.stump_map = np.zeros((self.terrain_grid, self.terrain_grid), dtype=bool)
+        self.stump_count = 0
+        self.river_width_grid = 2 
+        # Peta jarak ke sungai; river_mask/flood_mask adalah hasil lookup ke sana
+        self.river_dist = np.full((self.terrain_grid, self.terrain_grid), np.inf, dtype=np.float32)
+        self.flood_dist = np.full((self.terrain_grid, self.terrain_grid), np.inf, dtype=np.float32)
+        self.river_mask = np.zeros((self.terrain_grid, self.terrain_grid), dtype=bool)
+        self.land_mask = ~self.river_mask
+        self.flood_mask = np.zeros((self.terrain_grid, self.terrain_grid), dtype=bool)
+
+        # Daftar region kotor (koordinat grid) yang dikonsumsi renderer
+        self.terrain_dirty = []
+        self.terrain_full_redraw = True
+        
+        self.disaster_active = False
+        self.disaster_type = None
+        self.disaster_timer = 0
+        self.disaster_cooldown = 0
+        self.disaster_visual_intensity = 0.0 
+        self.warning_flash = 0.0
+        
+        self.is_raining = False
+        self.rain_timer = 0.0 
+        self.rain_duration = self.config.rain_duration
+        
+        self.total_disasters = 0
+        self.trees_lost_to_disaster = 0
+        
+        self.init_clouds()
+
+        self.initialize_forest()
+        
+    def init_clouds(self):
+        """Membangun cloud_count awan dari generator sendiri (turunan seed).
+
+        Awan murni visual: posisi awal dan kemunculan ulangnya memakai
+        cloud_rng, bukan self.rng, sehingga jumlah awan tidak mengubah hutan
+        ber-seed maupun jalannya simulasi.
+        """
+        rng = self.cloud_rng = np.random.default_rng(np.random.SeedSequence(self.seed).spawn(1)[0])
+        clouds = [
+            Cloud(rng.uniform(0, SIM_SIZE), rng.uniform(10, 80), rng.uniform(80, 150), rng.uniform(20, 50), (200, 200, 200, 150), rng),
+            Cloud(rng.uniform(0, SIM_SIZE), rng.uniform(50, 120), rng.uniform(100, 200), rng.uniform(10, 30), (220, 220, 220, 120), rng),
+            Cloud(rng.uniform(0, SIM_SIZE), rng.uniform(20, 100), rng.uniform(70, 130), rng.uniform(15, 40), (210, 210, 210, 130), rng),
+            Cloud(rng.uniform(0, SIM_SIZE), rng.uniform(60, 140), rng.uniform(90, 180), rng.uniform(25, 55), (230, 230, 230, 100), rng),
+            Cloud(rng.uniform(0, SIM_SIZE), rng.uniform(0, 50), rng.uniform(60, 120), rng.uniform(10, 25), (190, 190, 190, 160), rng),
+        ]
+        for i in range(len(clouds), self.cloud_count):
+            # Awan tambahan bergantian di lapisan 1..CLOUD_LAYERS-1
+            layer = 1 + (i - 5) % (CLOUD_LAYERS - 1)
+            depth = CLOUD_PARALLAX ** layer
+            clouds.append(Cloud(rng.uniform(0, SIM_SIZE), rng.uniform(0, 150), rng.uniform(50, 150) * depth,
+                                rng.uniform(10, 50) * depth, (200, 200, 200, 150), rng, layer))
+        self.clouds = clouds[:self.cloud_count]
+
+    def set_cloud_count(self, count):
+        """Mengatur jumlah awan dan membangun ulang langit."""
+        self.cloud_count = count
+        self.init_clouds()
+
+    def reset_simulation(self):
+        """Memanggil inisialisasi status untuk mengatur ulang simulasi."""
+        self.initialize_state()
+        log.info("\n=== SIMULASI DIRESET KE KONDISI AWAL ===")
+
+
+    def initialize_river(self):
+        """Membuat jalur sungai yang meliuk dari kiri atas ke kanan bawah."""
+        start_i, start_j = 1, 1 # Top-left start
+        end_i, end_j = self.terrain_grid - 2, self.terrain_grid - 2 # Bottom-right end
+
+        noise_scale = 0.2
+        amplitude = 5
+        current_j = start_j
+        
+        center_path = np.zeros((self.terrain_grid, self.terrain_grid), dtype=bool)
+        
+        for i in range(start_i, end_i + 1):
+            # Hitung noise offset
+            noise_val = smooth_noise(i * noise_scale) 
+            
+            # Interpolasi target j secara diagonal
+            j_trend = int(start_j + (end_j - start_j) * ((i - start_i) / (end_i - start_i)))
+            
+            # Terapkan noise untuk berkelok-kelok
+            j_offset = int((noise_val * 2 - 1) * amplitude)
+            next_j = max(1, min(self.terrain_grid - 2, j_trend + j_offset))
+
+            # Isi sel di antara current_j dan next_j
+            center_path[min(current_j, next_j):max(current_j, next_j) + 1, i] = True
+
+            current_j = next_j
+        
+        # Jarak ke garis tengah menentukan lebar sungai (normal maupun saat kekeringan),
+        # jarak ke badan sungai menentukan luas banjir.
+        self.river_dist = distance_transform(center_path, max_distance=self.river_width_grid)
+        self.river_mask = self.river_dist <= self.river_width_grid
+        self.land_mask = ~self.river_mask
+        self.flood_dist = distance_transform(self.river_mask, max_distance=self.config.max_flood_radius)
+        
+        self.deforestation_map[self.river_mask] = 0.0 # Pastikan sungai tidak memiliki vegetasi
+
+    def initialize_forest(self):
+        self.initialize_river() 
+        self.update_erosion_risk()
+        # Kepadatan awal sama dengan grid 20x20 (200 percobaan tanam), diskalakan dengan luas
+        attempts = self.rng.integers(1, self.terrain_grid - 1, size=(self.terrain_grid ** 2 // 2, 2))
+        for gx, gy in attempts.tolist(): 
+            if not self.river_mask[gy, gx]:
+                self.add_tree_by_grid(gx, gy)
+    
+    @property
+    def cell_px(self):
+        """Lebar satu sel dalam piksel; pecahan bila terrain_grid tidak membagi SIM_SIZE.
+
+        cell_size (bilangan bulat, minimal 1) hanya dipakai untuk ukuran sprite;
+        pemetaan posisi grid <-> piksel selalu memakai cell_px agar seluruh grid
+        mengisi tampilan SIM_SIZE.
+        """
+        return SIM_SIZE / self.terrain_grid
+
+    def grid_to_pixel(self, gx, gy):
+        cell_px = self.cell_px
+        x = gx * cell_px + cell_px // 2
+        y = gy * cell_px + cell_px // 2
+        return x, y
+
+    def pixel_to_grid(self, px, py):
+        cell_px = self.cell_px
+        return int(px // cell_px), int(py // cell_px)
+        
+    def add_tree_by_grid(self, gx, gy):
+        if self.river_mask[gy, gx]:
+            return
+        
+        if self.trees.add(gx, gy) < 0:
+            return
+
+        if self.stump_map[gy, gx]:
+            self.stump_map[gy, gx] = False
+            self.stump_count -= 1
+
+        self.stamp_neighborhood(gx, gy, np.maximum, 0.7, center_value=1.0)
+    
+    def remove_tree_by_pixel(self, px, py):
+        slot = self.find_nearest_tree(px, py, self.cell_px * 1.5)
+        if slot >= 0: 
+            gx, gy = int(self.trees.gx[slot]), int(self.trees.gy[slot])
+            self.trees.remove(slot)
+            self.add_stumps(gx, gy)
+
+            x, y = self.grid_to_pixel(gx, gy)
+            self.create_debris_effect(x, y, color_tuple=(120, 80, 40), size_range=(3, 7))
+            
+            self.stamp_neighborhood(gx, gy, np.minimum, 0.3, center_value=0.0)
+            return True
+        return False
+
+    def find_nearest_tree(self, px, py, max_dist):
+        """Slot pohon terdekat dari titik piksel dalam jarak max_dist (-1 jika tidak ada).
+
+        Hanya sel grid di sekitar titik yang diperiksa lewat indeks sel.
+        """
+        cx, cy = self.pixel_to_grid(px, py)
+        reach = int(math.ceil(max_dist / self.cell_px))
+        ys = slice(max(0, cy - reach), max(0, min(self.terrain_grid, cy + reach + 1)))
+        xs = slice(max(0, cx - reach), max(0, min(self.terrain_grid, cx + reach + 1)))
+
+        slots = self.trees.cell_index[ys, xs]
+        slots = slots[slots >= 0]
+        if slots.size == 0:
+            return -1
+
+        x, y = self.grid_to_pixel(self.trees.gx[slots], self.trees.gy[slots])
+        dist_sq = (x - px)**2 + (y - py)**2
+        nearest = int(np.argmin(dist_sq))
+        return int(slots[nearest]) if dist_sq[nearest] < max_dist ** 2 else -1
+
+    def add_stumps(self, gx, gy):
+        """Menandai sel (skalar atau array, tanpa duplikat) sebagai tunggul."""
+        self.stump_count += int(np.count_nonzero(~self.stump_map[gy, gx]))
+        self.stump_map[gy, gx] = True
+
+    def kill_trees(self, slots, damage_soil=True):
+        """Mematikan pohon pada slot (array) akibat bencana; mengembalikan jumlahnya."""
+        if slots.size == 0:
+            # Tanpa korban TreeStore.version tidak perlu berubah (cache renderer tetap valid)
+            return 0
+        gx, gy = self.trees.gx[slots], self.trees.gy[slots]
+        self.trees.remove(slots)
+        self.add_stumps(gx, gy)
+        if damage_soil:
+            self.stamp_cells(gx, gy, np.minimum, 0.1)
+        self.trees_lost_to_disaster += slots.size
+        return slots.size
+
+    def remove_20_percent_trees(self):
+        self.clear_cut(MASS_CUT_FRACTION)
+
+    def clear_cut(self, fraction, region=None):
+        """Penebangan massal sebagian `fraction` pohon dalam satu operasi array.
+
+        `region` (gx0, gy0, gx1, gy1), jika diberikan, membatasi penebangan ke
+        persegi sel [gx0, gx1) x [gy0, gy1). Mengembalikan jumlah pohon yang ditebang.
+        """
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError(f"fraction harus di antara 0 dan 1, bukan {fraction}")
+        if region is None:
+            slots = self.trees.alive_slots()
+        else:
+            gx0, gy0, gx1, gy1 = region
+            slots = self.trees.cell_index[max(0, gy0):max(0, gy1), max(0, gx0):max(0, gx1)].ravel()
+            slots = slots[slots >= 0]
+
+        num_to_remove = int(slots.size * fraction)
+        if num_to_remove == 0:
+            return 0
+
+        victims = self.rng.choice(slots, num_to_remove, replace=False)
+        gx, gy = self.trees.gx[victims], self.trees.gy[victims]
+        self.trees.remove(victims)
+        self.add_stumps(gx, gy)
+
+        x, y = self.grid_to_pixel(gx, gy)
+        self.create_debris_effect(x, y, color_tuple=(120, 80, 40), size_range=(3, 7))
+        self.stamp_cells(gx, gy, np.minimum, 0.3, center_value=0.0)
+
+        self.update_erosion_risk()
+        log.info("!!! Penebangan Massal: %d pohon ditebang (%.0f%% dari total) !!!", num_to_remove, fraction * 100)
+        return num_to_remove
+
+    def stamp_neighborhood(self, gx, gy, op, ring_value, center_value=None, radius=1):
+        """Menerapkan `op(sel, ring_value)` ke tetangga (gx, gy), lalu center_value ke pusatnya."""
+        ys = slice(max(0, gy - radius), min(self.terrain_grid, gy + radius + 1))
+        xs = slice(max(0, gx - radius), min(self.terrain_grid, gx + radius + 1))
+        new = op(self.deforestation_map[ys, xs], ring_value)
+        if center_value is not None:
+            new[gy - ys.start, gx - xs.start] = center_value
+        self.write_region(ys, xs, new)
+
+    def stamp_cells(self, gx, gy, op, ring_value, center_value=None):
+        """Versi massal stamp_neighborhood untuk array sel (gx, gy) sekaligus.
+
+        Hasilnya sama dengan menerapkan stamp satu per satu (op min/max bersifat
+        komutatif, center_value menang atas ring), tetapi dalam satu operasi array.
+        """
+        if gx.size == 0:
+            return
+        g = self.terrain_grid
+        ys = slice(max(0, int(gy.min()) - 1), min(g, int(gy.max()) + 2))
+        xs = slice(max(0, int(gx.min()) - 1), min(g, int(gx.max()) + 2))
+        h, w = ys.stop - ys.start, xs.stop - xs.start
+
+        # Pusat pada grid region yang diberi bingkai 1 sel, lalu dilatasi 3x3
+        centers = np.zeros((h + 2, w + 2), dtype=bool)
+        centers[gy - ys.start + 1, gx - xs.start + 1] = True
+        ring = np.zeros((h, w), dtype=bool)
+        for dy in range(3):
+            for dx in range(3):
+                ring |= centers[dy:dy + h, dx:dx + w]
+
+        block = self.deforestation_map[ys, xs]
+        new = np.where(ring, op(block, ring_value), block)
+        if center_value is not None:
+            new[centers[1:-1, 1:-1]] = center_value
+        self.write_region(ys, xs, new)
+
+    def write_region(self, ys, xs, values):
+        """Menulis nilai ke potongan deforestation_map (sel sungai dilewati).
+
+        Jumlah tutupan diperbarui dari selisih nilai lama dan baru, sehingga
+        biayanya sebanding dengan ukuran potongan, bukan ukuran grid.
+        """
+        block = self.deforestation_map[ys, xs]
+        values = np.where(self.land_mask[ys, xs], values, block)
+        self.coverage_sum += float((values - block).sum())
+        block[...] = values
+        self.mark_terrain_dirty(ys, xs)
+        self._refresh_erosion_risk()
+
+    def update_erosion_risk(self):
+        """Hitung ulang penuh (vektor) jumlah tutupan; dipakai setelah operasi massal."""
+        self.land_area = int(np.count_nonzero(self.land_mask))
+        self.coverage_sum = float(self.deforestation_map[self.land_mask].sum())
+        self._refresh_erosion_risk()
+
+    def _refresh_erosion_risk(self):
+        if self.land_area > 0:
+            forest_coverage = self.coverage_sum / self.land_area
+        else:
+            forest_coverage = 0.0
+
+        self.erosion_risk = 1.0 - forest_coverage
+        self.erosion_risk = clamp(self.erosion_risk, 0.0, 1.0)
+        
+        cfg = self.config
+        if self.erosion_risk < cfg.warning_low:
+            self.warning_level = 0
+        elif self.erosion_risk < cfg.warning_moderate:
+            self.warning_level = 1
+        elif self.erosion_risk < cfg.warning_high:
+            self.warning_level = 2
+        else:
+            self.warning_level = 3
+    
+    def step(self, n=1, dt=TICK_MS, on_tick=None):
+        """Menjalankan `n` tick simulasi dengan langkah waktu tetap `dt` (ms).
+
+        Dengan seed yang sama, urutan step() yang sama selalu menghasilkan
+        state yang identik, berapa pun frame rate tampilannya. `on_tick(sim)`,
+        jika diberikan, dipanggil setelah setiap tick (misalnya untuk merekam metrik).
+        """
+        for _ in range(n):
+            self.update(dt)
+            self.tick_count += 1
+            if on_tick is not None:
+                on_tick(self)
+
+    def advance(self, elapsed_ms, on_tick=None):
+        """Mengakumulasi waktu nyata dan menjalankan tick tetap yang sudah jatuh tempo.
+
+        Mengembalikan jumlah tick yang dijalankan. Sisa waktu yang lebih dari
+        MAX_TICKS_PER_ADVANCE tick dibuang agar simulasi tidak tertinggal terus.
+        `on_tick` diteruskan ke step().
+        """
+        self.time_accumulator += elapsed_ms
+        ticks = int(self.time_accumulator // TICK_MS)
+        if ticks > MAX_TICKS_PER_ADVANCE:
+            ticks = MAX_TICKS_PER_ADVANCE
+            self.time_accumulator = 0.0
+        else:
+            self.time_accumulator -= ticks * TICK_MS
+        self.step(ticks, on_tick=on_tick)
+        return ticks
+
+    def update(self, dt_ms):
+        cfg = self.config
+        dt = dt_ms / 1000.0
+        self.warning_flash = (self.warning_flash + dt * 3) % (2 * math.pi)
+        self.lightning_active = max(0.0, self.lightning_active - dt)
+        
+        # Update Clouds
+        for cloud in self.clouds:
+            cloud.update(dt_ms)
+            
+        self.particles.update(dt_ms)
+        self.rain_particles.update(dt_ms)
+        
+        if self.is_raining:
+            self.rain_timer += dt
+            
+            # Pemicu kilat yang lebih realistis
+            if self.rng.random() < cfg.lightning_prob and self.lightning_active == 0.0: 
+                self.lightning_active = 0.1 # Kilat berlangsung 0.1 detik
+                self.quake_offset_x = self.rng.uniform(-3, 3) 
+                self.quake_offset_y = self.rng.uniform(-3, 3)
+            
+            # Spawn hujan
+            if self.rng.random() < cfg.rain_spawn_prob:
+                self.rain_particles.emit(self.rng.integers(0, SIM_SIZE + 1), self.rng.integers(0, SIM_SIZE + 1),
+                                         COLOR_RAIN, lifetime=(0.5, 1.5), size_range=(1, 2),
+                                         vel_x=(50, 100), vel_y=(300, 500), gravity=1500.0)
+            
+            if self.rain_timer >= self.rain_duration:
+                self.is_raining = False
+                self.rain_timer = 0.0
+                self.disaster_active = True
+                self.disaster_timer = self.rng.uniform(cfg.disaster_duration_min, cfg.disaster_duration_max)
+                self.total_disasters += 1
+                self.disaster_visual_intensity = 1.0
+                self.execute_disaster(is_wet_phase=True)
+                log.info("!!! BENCANA AKTIF: %s !!!", self.disaster_type.upper())
+            return 
+
+        if self.disaster_active:
+            self.disaster_timer -= dt
+            self.disaster_visual_intensity = max(0.0, min(1.0, self.disaster_timer / 7.0)) 
+            
+            if self.lightning_active > 0:
+                # Guncangan karena kilat yang baru saja terjadi
+                pass
+            elif self.disaster_type == 'earthquake':
+                self.quake_offset_x = self.rng.uniform(-5, 5) * self.disaster_visual_intensity
+                self.quake_offset_y = self.rng.uniform(-5, 5) * self.disaster_visual_intensity
+            else:
+                self.quake_offset_x = 0
+                self.quake_offset_y = 0
+
+            if self.disaster_timer <= 0:
+                self.disaster_active = False
+                self.disaster_cooldown = cfg.disaster_cooldown
+                self.disaster_visual_intensity = 0.0
+                self.flood_mask[:] = False
+                self.mark_terrain_dirty()
+                self.quake_offset_x = 0
+                self.quake_offset_y = 0
+        else:
+            self.disaster_cooldown = max(0, self.disaster_cooldown - dt)
+            self.quake_offset_x = 0
+            self.quake_offset_y = 0
+            
+            if self.disaster_cooldown <= 0:
+                prob = 0
+                if self.erosion_risk > cfg.disaster_risk_high:
+                    prob = cfg.disaster_prob_high
+                elif self.erosion_risk > cfg.disaster_risk_moderate:
+                    prob = cfg.disaster_prob_moderate
+                    
+                if self.rng.random() < prob:
+                    self.trigger_disaster()
+        
+    def trigger_disaster(self):
+        cfg = self.config
+        disaster_types = []
+        if self.erosion_risk > cfg.disaster_risk_moderate:
+            disaster_types.extend(['landslide', 'flood'])
+        if self.erosion_risk > cfg.disaster_risk_high:
+            disaster_types.extend(['earthquake', 'drought'])
+        self.disaster_type = disaster_types[self.rng.integers(len(disaster_types))] if disaster_types else None
+        
+        if self.disaster_type:
+            if self.disaster_type in ['landslide', 'flood']:
+                self.is_raining = True
+                self.rain_timer = 0.0
+                log.info("\n[WEATHER WARNING] Hujan lebat mendekati area. Risiko %s!", self.disaster_type.upper())
+            else:
+                self.disaster_active = True
+                self.disaster_timer = self.rng.uniform(cfg.disaster_duration_min, cfg.disaster_duration_max)
+                self.total_disasters += 1
+                self.disaster_visual_intensity = 1.0
+                self.execute_disaster(is_wet_phase=False)
+                log.info("\n!!! BENCANA AKTIF: %s !!!", self.disaster_type.upper())
+    
+    def execute_disaster(self, is_wet_phase):
+        self.flood_mask[:] = False
+        if self.disaster_type == 'landslide':
+            self.landslide_effect()
+        elif self.disaster_type == 'flood':
+            self.flood_effect(is_wet_phase)
+        elif self.disaster_type == 'earthquake':
+            self.earthquake_effect()
+        elif self.disaster_type == 'drought':
+            self.drought_effect()
+        self.update_erosion_risk()
+        self.mark_terrain_dirty()
+
+    def landslide_effect(self):
+        self.flood_mask = self.get_flooded_area(radius=self.config.landslide_flood_radius)
+        center_gx = int(self.rng.integers(3, self.terrain_grid - 3))
+        center_gy = int(self.rng.integers(3, self.terrain_grid - 3))
+        radius_grid = self.config.landslide_radius
+        
+        ys = slice(max(0, center_gy - radius_grid), min(self.terrain_grid, center_gy + radius_grid + 1))
+        xs = slice(max(0, center_gx - radius_grid), min(self.terrain_grid, center_gx + radius_grid + 1))
+        jj, ii = np.mgrid[ys, xs]
+        in_slide = (ii - center_gx)**2 + (jj - center_gy)**2 < radius_grid**2
+        self.write_region(ys, xs, np.where(in_slide & ~self.flood_mask[ys, xs], 0.0, self.deforestation_map[ys, xs]))
+        
+        # Debris tanah 1-3 partikel per sel longsor, dikelompokkan per jumlah
+        slide_x, slide_y = self.grid_to_pixel(ii[in_slide], jj[in_slide])
+        debris_counts = self.rng.integers(1, 4, slide_x.size)
+        for count in range(1, 4):
+            picked = debris_counts == count
+            self.create_debris_effect(slide_x[picked], slide_y[picked], color_tuple=COLOR_SOIL, size_range=(3, 6), count=count)
+        
+        slots = self.trees.cell_index[ys, xs][in_slide]
+        slots = slots[slots >= 0]
+        x, y = self.grid_to_pixel(self.trees.gx[slots], self.trees.gy[slots])
+        self.create_debris_effect(x, y, color_tuple=(50, 150, 50), size_range=(4, 6))
+        trees_killed = self.kill_trees(slots, damage_soil=False)
+        
+        log.info("     >>> Tanah longsor menghancurkan %d pohon!", trees_killed)
+
+    def flood_effect(self, is_wet_phase):
+        cfg = self.config
+        self.flood_mask = self.get_flooded_area(radius=cfg.flood_radius) 
+        
+        slots = self.trees.alive_slots()
+        is_in_flood = self.flood_mask[self.trees.gy[slots], self.trees.gx[slots]]
+        hit = slots[is_in_flood | (self.rng.random(slots.size) < cfg.flood_stray_prob)]
+        self.trees.damage(hit, cfg.flood_health_factor)
+
+        trees_killed = self.kill_trees(slots[self.trees.health[slots] < cfg.dead_health])
+
+        self.deforestation_map *= cfg.flood_map_decay
+        log.info("     >>> Banjir merusak pohon, %d pohon mati!", trees_killed)
+
+    def earthquake_effect(self):
+        slots = self.trees.alive_slots()
+        dead = slots[self.rng.random(slots.size) > 1.0 - self.config.earthquake_kill_prob]
+
+        x, y = self.grid_to_pixel(self.trees.gx[dead], self.trees.gy[dead])
+        self.create_debris_effect(x, y, color_tuple=(150, 150, 150), size_range=(5, 10), count=15)
+        trees_killed = self.kill_trees(dead)
+
+        log.info("     >>> Gempa menghancurkan %d pohon!", trees_killed)
+    
+    def drought_effect(self):
+        self.drought_river_width = 1.0
+        
+        cfg = self.config
+        slots = self.trees.alive_slots()
+        hit = slots[self.rng.random(slots.size) < cfg.drought_hit_prob]
+        self.trees.damage(hit, cfg.drought_health_factor)
+
+        trees_killed = self.kill_trees(slots[self.trees.health[slots] < cfg.dead_health])
+
+        self.deforestation_map *= cfg.drought_map_decay
+        log.info("     >>> Kekeringan membunuh %d pohon! Sungai mengering.", trees_killed)
+
+
+    def get_flooded_area(self, radius=2):
+        """Mask sel yang tergenang: sel dalam jarak efektif dari badan sungai."""
+        # Tambahkan faktor erosi untuk menentukan area banjir yang lebih besar
+        erosion_factor = self.erosion_risk * self.config.flood_erosion_factor
+        effective_radius = min(radius + erosion_factor, self.config.max_flood_radius)
+        return self.flood_dist <= effective_radius
+
+    def create_debris_effect(self, x, y, color_tuple, size_range, count=10):
+        x, y = np.broadcast_arrays(np.atleast_1d(x), np.atleast_1d(y))
+        budget = max(1, MAX_DEBRIS_PER_BATCH // count)
+        if x.size > budget:
+            # Batch yang sangat besar (penebangan massal) cukup diwakili sebagian titik asal
+            picked = self.rng.random(x.size) < budget / x.size
+            x, y = x[picked], y[picked]
+        self.particles.emit(x, y, color_tuple, count=count, lifetime=(0.5, 1.5),
+                            size_range=size_range, spread=10)
+    
+    def vegetation_field(self, y0=0, y1=None, x0=0, x1=None):
+        """Tutupan vegetasi halus per sel untuk region [y0:y1, x0:x1].
+
+        Rata-rata bilinear dari empat sudut sel (sel, kanan, bawah, kanan-bawah);
+        sudut di sungai/banjir bernilai 0, sudut di luar grid memakai tepi peta.
+        """
+        g = self.terrain_grid
+        y1 = g if y1 is None else y1
+        x1 = g if x1 is None else x1
+        rows = np.arange(y0, y1 + 1)
+        cols = np.arange(x0, x1 + 1)
+        ix = np.ix_(np.minimum(rows, g - 1), np.minimum(cols, g - 1))
+
+        corners = self.deforestation_map[ix]
+        inside = (rows < g)[:, None] & (cols < g)[None, :]
+        water = inside & (self.river_mask[ix] | self.flood_mask[ix])
+        corners = np.where(water, 0.0, corners)
+
+        return (corners[:-1, :-1] + corners[:-1, 1:] + corners[1:, :-1] + corners[1:, 1:]) / 4.0
+
+    def mark_terrain_dirty(self, ys=None, xs=None):
+        """Menandai sel peta yang perlu dirender ulang di lapisan terrain (None = semua).
+
+        Hanya renderer yang mengosongkan tanda ini; selama render penuh masih
+        tertunda (termasuk sepanjang run headless) region tidak perlu dicatat.
+        """
+        if self.terrain_full_redraw:
+            return
+        if ys is None or xs is None:
+            self.terrain_full_redraw = True
+            self.terrain_dirty.clear()
+            return
+        # Warna sel (i, j) memakai nilai peta (i..i+1, j..j+1), jadi perluas satu sel ke kiri/atas
+        self.terrain_dirty.append((max(0, ys.start - 1), ys.stop, max(0, xs.start - 1), xs.stop))
+
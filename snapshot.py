@@ -0,0 +1,183 @@
+"""Simpan dan muat state lengkap DeforestationSimulation dalam format biner berversi.
+
+Tata letak file:
+
+    [16 byte header: magic, versi, panjang metadata]
+    [metadata JSON: skalar, config, state RNG, direktori array]
+    [blok array mentah, masing-masing rata 64 byte]
+
+Karena array disimpan mentah dan rata, load_snapshot() bisa memetakan file
+dengan mmap dan menjadikan array peta sebagai view tanpa salinan. Mode
+copy-on-write membuat simulasi tetap bisa menulis ke array tersebut tanpa
+mengubah file snapshot.
+"""
+import dataclasses
+import io
+import json
+import os
+import struct
+
+import numpy as np
+
+from simulation import Cloud, DeforestationSimulation, ParticleSystem, SimulationConfig, TreeStore
+
+SNAPSHOT_MAGIC = b'DEFSNAP\x00'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ALIGN = 64
+_HEADER = struct.Struct('<8sII')
+
+# Atribut skalar simulasi yang disimpan apa adanya di metadata
+SIM_SCALARS = (
+    'terrain_grid', 'cell_size', 'seed', 'tick_count', 'time_accumulator', 'cloud_count',
+    'erosion_risk', 'warning_level', 'coverage_sum', 'land_area', 'stump_count', 'river_width_grid',
+    'disaster_active', 'disaster_type', 'disaster_timer', 'disaster_cooldown',
+    'disaster_visual_intensity', 'warning_flash', 'is_raining', 'rain_timer', 'rain_duration',
+    'total_disasters', 'trees_lost_to_disaster', 'quake_offset_x', 'quake_offset_y', 'lightning_active',
+)
+SIM_ARRAYS = ('deforestation_map', 'river_dist', 'flood_dist', 'river_mask', 'land_mask', 'flood_mask', 'stump_map')
+TREE_ARRAYS = ('gx', 'gy', 'health', 'alive', 'dying', 'cell_index')
+PARTICLE_ARRAYS = ('pos', 'vel', 'age', 'lifetime', 'size', 'gravity', 'color')
+CLOUD_FIELDS = ('x', 'y', 'size', 'speed', 'color', 'layer', 'width', 'height')
+
+class SnapshotError(ValueError):
+    pass
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+def _align(n):
+    return -(-n // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+
+def save_snapshot(sim, path):
+    """Menulis seluruh state `sim` ke `path`.
+
+    Ditulis ke file sementara lalu di-rename: simulasi hasil load_snapshot()
+    bisa masih memetakan `path`, jadi file itu tidak boleh dipotong saat ditulis ulang.
+    """
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            _write(sim, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def snapshot_bytes(sim):
+    """Snapshot dalam memori (misalnya keyframe replay), dibaca dengan restore_bytes()."""
+    f = io.BytesIO()
+    _write(sim, f)
+    return f.getvalue()
+
+def _write(sim, f):
+    trees = sim.trees
+    arrays = {name: getattr(sim, name) for name in SIM_ARRAYS}
+    arrays.update({f'trees.{name}': getattr(trees, name) for name in TREE_ARRAYS})
+    arrays['trees.free'] = np.asarray(trees.free, dtype=np.int32)
+    for system in ('particles', 'rain_particles'):
+        ps = getattr(sim, system)
+        arrays.update({f'{system}.{name}': getattr(ps, name)[:ps.count] for name in PARTICLE_ARRAYS})
+
+    directory = {}
+    offset = 0
+    for name, arr in arrays.items():
+        directory[name] = {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': offset}
+        offset = _align(offset + arr.nbytes)
+
+    meta = {
+        'scalars': {name: _scalar(getattr(sim, name)) for name in SIM_SCALARS},
+        'trees': {'size': trees.size, 'count': trees.count},
+        'clouds': [{f: _scalar(getattr(c, f)) for f in CLOUD_FIELDS} for c in sim.clouds],
+        'config': dataclasses.asdict(sim.config),
+        'rng': sim.rng.bit_generator.state,
+        'cloud_rng': sim.cloud_rng.bit_generator.state,
+        'arrays': directory,
+    }
+    meta_bytes = json.dumps(meta).encode('utf-8')
+    data_start = _align(_HEADER.size + len(meta_bytes))
+
+    f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(meta_bytes)))
+    f.write(meta_bytes)
+    for name, arr in arrays.items():
+        f.seek(data_start + directory[name]['offset'])
+        f.write(np.ascontiguousarray(arr).data)
+    # Padding sampai akhir blok terakhir agar setiap view array berada di dalam file
+    end = f.seek(0, io.SEEK_END)
+    f.write(bytes(data_start + offset - end))
+
+def _read_meta(f):
+    magic, version, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Bukan file snapshot simulasi deforestasi")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Versi snapshot {version} tidak didukung (diharapkan {SNAPSHOT_VERSION})")
+    return json.loads(f.read(meta_len)), _align(_HEADER.size + meta_len)
+
+def load_snapshot(path, mmap=True):
+    """Membuat DeforestationSimulation dari snapshot.
+
+    Dengan mmap=True array dibaca sebagai view copy-on-write atas file
+    (tanpa salinan; halaman baru disalin saat pertama ditulis). Dengan
+    mmap=False semua array dibaca ke memori.
+    """
+    with open(path, 'rb') as f:
+        meta, data_start = _read_meta(f)
+        if mmap:
+            buffer = np.memmap(f, dtype=np.uint8, mode='c')
+        else:
+            f.seek(0)
+            buffer = np.frombuffer(bytearray(f.read()), dtype=np.uint8)
+    return _restore(meta, data_start, buffer)
+
+def restore_bytes(data):
+    """Membuat simulasi dari hasil snapshot_bytes(); array disalin sehingga `data` bisa dipakai ulang."""
+    f = io.BytesIO(data)
+    meta, data_start = _read_meta(f)
+    return _restore(meta, data_start, np.frombuffer(bytearray(data), dtype=np.uint8))
+
+def _restore(meta, data_start, buffer):
+    def array(name):
+        spec = meta['arrays'][name]
+        return np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']),
+                          buffer=buffer, offset=data_start + spec['offset'])
+
+    # Lewati __init__: snapshot sudah berisi hutan dan sungai yang jadi
+    sim = DeforestationSimulation.__new__(DeforestationSimulation)
+    for name, value in meta['scalars'].items():
+        setattr(sim, name, value)
+    for name in SIM_ARRAYS:
+        setattr(sim, name, array(name))
+    sim.config = SimulationConfig(**meta['config'])
+    sim.rng = np.random.default_rng()
+    sim.rng.bit_generator.state = meta['rng']
+    sim.terrain_dirty = []
+    sim.terrain_full_redraw = True
+
+    trees = TreeStore.__new__(TreeStore)
+    for name in TREE_ARRAYS:
+        setattr(trees, name, array(f'trees.{name}'))
+    trees.size = meta['trees']['size']
+    trees.count = meta['trees']['count']
+    trees.free = array('trees.free').tolist()
+    trees.version = 0
+    sim.trees = trees
+
+    for system, capacity in (('particles', 4096), ('rain_particles', 1024)):
+        pos = array(f'{system}.pos')
+        ps = ParticleSystem(capacity=max(capacity, len(pos)), rng=sim.rng)
+        for name in PARTICLE_ARRAYS:
+            getattr(ps, name)[:len(pos)] = array(f'{system}.{name}')
+        ps.count = len(pos)
+        setattr(sim, system, ps)
+
+    sim.cloud_rng = np.random.default_rng()
+    sim.cloud_rng.bit_generator.state = meta['cloud_rng']
+    sim.clouds = []
+    for fields in meta['clouds']:
+        cloud = Cloud(fields['x'], fields['y'], fields['size'], fields['speed'], tuple(fields['color']), sim.cloud_rng,
+                      fields['layer'])
+        cloud.width = fields['width']
+        cloud.height = fields['height']
+        sim.clouds.append(cloud)
+    return sim
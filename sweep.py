@@ -0,0 +1,170 @@
+"""Sweep parameter SimulationConfig dengan cache hasil di disk.
+
+Titik sweep dibentuk dari grid (produk kartesius) atau Latin hypercube.
+Setiap pasangan (config, seed) dievaluasi sekali; hasilnya disimpan sebagai
+file JSON kecil bernama hash kunci tersebut, sehingga menjalankan ulang sweep
+yang diperluas hanya menghitung titik yang belum ada.
+"""
+import argparse
+import csv
+import dataclasses
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+
+import numpy as np
+
+from ensemble import METRICS, run_member
+from simulation import SimulationConfig
+
+CACHE_VERSION = 2 # Naikkan bila perilaku simulasi berubah agar cache lama tidak dipakai
+DEFAULT_CACHE_DIR = '.sweep_cache'
+
+# ============ Pembentukan Titik Sweep ============
+def grid_points(space):
+    """Produk kartesius dari {nama_parameter: [nilai, ...]}."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+def latin_hypercube(space, n, seed=0):
+    """`n` titik Latin hypercube dari {nama_parameter: (min, max)}.
+
+    Setiap parameter dibagi menjadi `n` strata sama lebar dan setiap strata
+    dipakai tepat sekali; parameter bertipe int dibulatkan.
+    """
+    rng = np.random.default_rng(seed)
+    types = {f.name: f.type for f in dataclasses.fields(SimulationConfig)}
+    points = [{} for _ in range(n)]
+    for name, (lo, hi) in space.items():
+        u = (rng.permutation(n) + rng.random(n)) / n
+        values = lo + (hi - lo) * u
+        for point, v in zip(points, values.tolist()):
+            point[name] = round(v) if types[name] is int else v
+    return points
+
+def make_config(params, base=None):
+    return dataclasses.replace(base if base is not None else SimulationConfig(), **params)
+
+# ============ Cache ============
+def cache_key(config, seed, grid, ticks, policy):
+    payload = {
+        'version': CACHE_VERSION,
+        'config': dataclasses.asdict(config),
+        'seed': seed, 'grid': grid, 'ticks': ticks, 'policy': policy,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + '.json')
+
+def load_cached(cache_dir, key):
+    try:
+        with open(_cache_path(cache_dir, key)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def store_cached(cache_dir, key, result):
+    path = _cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Tulis ke file sementara lalu rename agar proses yang terhenti tidak meninggalkan file rusak
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(result, f)
+    os.replace(tmp, path)
+
+# ============ Evaluasi ============
+def evaluate(config, seed, grid, ticks, policy='none'):
+    """Metrik akhir satu simulasi sebagai dict {metrik: nilai}."""
+    final = run_member(seed, grid, ticks, ticks, policy, config)[-1]
+    return dict(zip(METRICS, final.tolist()))
+
+def _evaluate_task(task):
+    key, config, seed, grid, ticks, policy, cache_dir = task
+    result = evaluate(config, seed, grid, ticks, policy)
+    store_cached(cache_dir, key, result)
+    return key, result
+
+def run_sweep(points, seeds, grid=20, ticks=3600, policy='none',
+              cache_dir=DEFAULT_CACHE_DIR, processes=None, base=None):
+    """Mengevaluasi setiap titik sweep untuk setiap seed, memakai cache bila ada.
+
+    Mengembalikan daftar baris {parameter..., 'seed', metrik...} dengan urutan
+    titik x seed, terlepas dari urutan penyelesaian di pool.
+    """
+    jobs = []
+    for params in points:
+        config = make_config(params, base)
+        for seed in seeds:
+            jobs.append((params, seed, cache_key(config, seed, grid, ticks, policy), config))
+
+    results = {}
+    pending = []
+    for params, seed, key, config in jobs:
+        cached = load_cached(cache_dir, key)
+        if cached is not None:
+            results[key] = cached
+        elif key not in results:
+            results[key] = None
+            pending.append((key, config, seed, grid, ticks, policy, cache_dir))
+
+    print(f"Sweep: {len(jobs)} evaluasi, {len(jobs) - len(pending)} dari cache, {len(pending)} dihitung.")
+    if pending:
+        processes = processes or os.cpu_count() or 1
+        if processes == 1:
+            for key, result in map(_evaluate_task, pending):
+                results[key] = result
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                for key, result in pool.imap_unordered(_evaluate_task, pending):
+                    results[key] = result
+
+    return [{**params, 'seed': seed, **results[key]} for params, seed, key, _ in jobs]
+
+# ============ Main Execution ============
+def _parse_space(specs, lhs):
+    """Mengurai argumen --param nama=v1,v2,... (grid) atau nama=min:max (LHS)."""
+    types = {f.name: f.type for f in dataclasses.fields(SimulationConfig)}
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in types:
+            raise SystemExit(f"Parameter tidak dikenal: {name}")
+        cast = int if types[name] is int else float
+        if lhs:
+            lo, _, hi = values.partition(':')
+            space[name] = (float(lo), float(hi))
+        else:
+            space[name] = [cast(v) for v in values.split(',')]
+    return space
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep parameter simulasi deforestasi")
+    parser.add_argument('--param', action='append', default=[], required=True,
+                        help="nama=v1,v2 (grid) atau nama=min:max (dengan --lhs); boleh berulang")
+    parser.add_argument('--lhs', type=int, default=0, help="Jumlah titik Latin hypercube (0 = grid)")
+    parser.add_argument('--seeds', type=int, default=4, help="Jumlah seed per titik (default: 4)")
+    parser.add_argument('--ticks', type=int, default=3600, help="Tick per simulasi (default: 3600)")
+    parser.add_argument('--grid', type=int, default=20, help="Jumlah sel grid per sisi (default: 20)")
+    parser.add_argument('--policy', default='none', help="Kebijakan deforestasi (lihat ensemble.POLICIES)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Direktori cache hasil")
+    parser.add_argument('--processes', type=int, default=None, help="Jumlah proses (default: semua core)")
+    parser.add_argument('--out', default=None, help="Simpan hasil ke file CSV")
+    args = parser.parse_args()
+
+    space = _parse_space(args.param, args.lhs)
+    points = latin_hypercube(space, args.lhs) if args.lhs else grid_points(space)
+    rows = run_sweep(points, range(args.seeds), grid=args.grid, ticks=args.ticks, policy=args.policy,
+                     cache_dir=args.cache_dir, processes=args.processes)
+
+    if args.out:
+        with open(args.out, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Hasil disimpan ke {args.out}")
+    else:
+        for row in rows:
+            print(row)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from replay import (EVENT_CUT, EVENT_MASS_CUT, EVENT_PLANT, EVENT_RESET, EventLog, ReplayEngine,
+                    apply_event)
+from simulation import DeforestationSimulation, SimulationConfig
+from snapshot import load_snapshot, save_snapshot
+
+def assert_same_state(a, b):
+    assert a.tick_count == b.tick_count
+    assert a.erosion_risk == b.erosion_risk
+    assert a.total_disasters == b.total_disasters
+    for name in ('deforestation_map', 'stump_map', 'flood_mask'):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+    for name in ('gx', 'gy', 'health', 'alive', 'cell_index'):
+        np.testing.assert_array_equal(getattr(a.trees, name), getattr(b.trees, name))
+    assert a.rng.bit_generator.state == b.rng.bit_generator.state
+
+# Bencana sering terjadi agar jalur acak (hujan, partikel, korban) ikut teruji
+BUSY = SimulationConfig(disaster_risk_moderate=0.0, disaster_risk_high=0.0, disaster_prob_moderate=0.05,
+                        disaster_prob_high=0.05, disaster_cooldown=1.0, rain_duration=1.0)
+
+def busy_sim(seed=11):
+    sim = DeforestationSimulation(terrain_grid=30, seed=seed, config=BUSY)
+    sim.clear_cut(0.4)
+    return sim
+
+@pytest.fixture
+def sim():
+    return DeforestationSimulation(terrain_grid=20, seed=7)
+
+@pytest.mark.parametrize('fraction', [-0.2, 1.5])
+def test_clear_cut_rejects_fraction_out_of_range(sim, fraction):
+    trees = len(sim.trees)
+    with pytest.raises(ValueError, match='fraction'):
+        sim.clear_cut(fraction)
+    assert len(sim.trees) == trees
+
+@pytest.mark.parametrize('fraction', [0.0, 1.0])
+def test_clear_cut_accepts_bounds(sim, fraction):
+    trees = len(sim.trees)
+    removed = sim.clear_cut(fraction)
+    assert removed == int(trees * fraction)
+    assert len(sim.trees) == trees - removed
+
+def test_save_snapshot_over_mapped_file(tmp_path):
+    path = str(tmp_path / 'ck.snap')
+    save_snapshot(DeforestationSimulation(terrain_grid=60, seed=3), path)
+    sim = load_snapshot(path)
+    sim.clear_cut(0.3)
+    sim.step(30)
+    save_snapshot(sim, path)
+    assert_same_state(load_snapshot(path), sim)
+
+def test_same_seed_gives_same_state():
+    a, b = busy_sim(), busy_sim()
+    a.step(2000)
+    b.step(2000)
+    assert a.total_disasters > 0
+    assert_same_state(a, b)
+
+def test_resumed_snapshot_matches_uninterrupted_run(tmp_path):
+    path = str(tmp_path / 'mid.snap')
+    a = busy_sim()
+    a.step(500)
+    save_snapshot(a, path)
+    b = load_snapshot(path)
+    a.step(1500)
+    b.step(1500)
+    assert_same_state(a, b)
+
+def test_replay_seek_from_keyframe_matches_replay_from_start():
+    live = DeforestationSimulation(terrain_grid=30, seed=11, config=BUSY)
+    log = EventLog.for_simulation(live)
+    # (tick, jenis, a, b) dicatat lalu diterapkan, seperti App.dispatch
+    session = [(40, EVENT_PLANT, 3, 4), (90, EVENT_CUT, 300, 300), (150, EVENT_MASS_CUT, 0, 0),
+               (150, EVENT_PLANT, 10, 12), (260, EVENT_RESET, 0, 0), (330, EVENT_MASS_CUT, 0, 0)]
+    for tick, kind, a, b in session:
+        live.step(tick - live.tick_count)
+        log.record(live.tick_count, kind, a, b)
+        apply_event(live, kind, a, b)
+
+    engine = ReplayEngine(log, keyframe_interval=50)
+    assert_same_state(engine.run_to_end(), live)
+    assert engine.keyframes
+    for tick in (0, 120, 150, 275, live.tick_count):
+        from_start = ReplayEngine(log, keyframe_interval=0).seek(tick)
+        assert_same_state(engine.seek(tick), from_start)
+
+def test_incremental_coverage_matches_full_recount():
+    sim = busy_sim()
+    sim.add_tree_by_grid(5, 5)
+    sim.remove_tree_by_pixel(300, 300)
+    sim.clear_cut(0.3, region=(0, 0, 15, 15))
+    sim.step(1000)
+    coverage, risk = sim.coverage_sum, sim.erosion_risk
+    sim.update_erosion_risk()
+    assert coverage == pytest.approx(sim.coverage_sum)
+    assert risk == pytest.approx(sim.erosion_risk)
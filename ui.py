@@ -0,0 +1,337 @@
+"""Panel info dan tombol kontrol di sisi kanan layar."""
+import math
+from collections import OrderedDict
+
+import pygame
+
+from colors import *
+from renderer import lerp_color
+from simulation import SIM_SIZE
+
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 600
+INFO_WIDTH = SCREEN_WIDTH - SIM_SIZE
+
+# ============ Font (Dikecilkan) ============
+# Dimuat oleh init_fonts() setelah pygame.init()
+FONT_SMALL = FONT_MEDIUM = FONT_LARGE = FONT_TINY = None
+
+def init_fonts():
+    global FONT_SMALL, FONT_MEDIUM, FONT_LARGE, FONT_TINY
+    font_name = pygame.font.match_font('segoeui') or pygame.font.match_font('arial')
+    FONT_SMALL = pygame.font.Font(font_name, 16) 
+    FONT_MEDIUM = pygame.font.Font(font_name, 20) 
+    FONT_LARGE = pygame.font.Font(font_name, 30) 
+    FONT_TINY = pygame.font.Font(font_name, 12)
+
+# ============ Kelas Tombol UI ============
+class Button:
+    def __init__(self, x, y, w, h, text, font, color, hover_color, action):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.text = text
+        self.font = font
+        self.color = color
+        self.hover_color = hover_color
+        self.action = action
+        self.is_hovered = False
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.is_hovered = self.rect.collidepoint(event.pos)
+        
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.is_hovered:
+                return self.action
+        return None
+
+    def draw(self, surface, origin=(0, 0), text_surf=None):
+        """Menggambar tombol; `origin` adalah posisi layar dari pojok kiri atas `surface`."""
+        current_color = self.hover_color if self.is_hovered else self.color
+        rect = self.rect.move(-origin[0], -origin[1])
+        
+        # Gambar bayangan/border (sedikit)
+        # Catatan: pygame.draw.rect mendukung border_radius
+        pygame.draw.rect(surface, COLOR_BLACK, rect.inflate(2, 2), border_radius=5)
+        
+        # Gambar tombol
+        # Catatan: pygame.draw.rect mendukung border_radius
+        pygame.draw.rect(surface, current_color, rect, border_radius=5)
+        
+        # Teks tombol
+        if text_surf is None:
+            text_surf = self.font.render(self.text, True, COLOR_WHITE)
+        text_rect = text_surf.get_rect(center=rect.center)
+        surface.blit(text_surf, text_rect)
+
+# ============ Panel Info ============
+TEXT_CACHE_CAPACITY = 256 # Jumlah maksimum teks ter-render yang di-cache (LRU)
+DISASTER_NAMES = {'landslide': 'TANAH LONGSOR!', 'flood': 'BANJIR BESAR!', 'earthquake': 'GEMPA BUMI!', 'drought': 'KEKERINGAN!'}
+WARNING_STATUS = {0: ("AMAN", COLOR_SAFE, "Keseimbangan Ekosistem"), 
+                  1: ("WASPADA", COLOR_WARNING, "Tingkat Erosi Meningkat"), 
+                  2: ("BAHAYA!", COLOR_DANGER, "Risiko Bencana Signifikan"), 
+                  3: ("KRITIS!!!", COLOR_DANGER, "Bencana Sudah Dekat")}
+
+class InfoPanel:
+    """Panel info yang dirender ke surface offscreen dan hanya dibangun ulang saat isinya berubah.
+
+    Setiap frame draw() menghitung nilai yang ditampilkan (teks status, persen
+    erosi pada presisi tampilan, jumlah pohon, mode, hover tombol). Jika sama
+    dengan frame sebelumnya, panel cukup di-blit sekali; tanda "!" yang
+    berkedip digambar sebagai overlay di atasnya.
+    """
+    def __init__(self):
+        if FONT_SMALL is None:
+            init_fonts()
+        self.setup_buttons()
+        # Tata letak di atas tombol tetap (margin 5+5, judul 50, status 80+5, statistik 180+5),
+        # jadi posisi tombol cukup dihitung sekali
+        self.button_y_end = self._reposition_buttons(5 + 5 + 25 * 2 + 80 + 5 + 180 + 5)
+        self.surface = pygame.Surface((INFO_WIDTH, SCREEN_HEIGHT))
+        self.text_cache = OrderedDict()
+        self.state = None
+        self.rebuilds = 0
+        self.flash_icon = None # (surface, posisi layar) tanda "!" bila peringatan aktif
+
+    def text(self, font, text, color):
+        """Teks ter-render dari cache LRU, dikunci oleh (font, teks, warna)."""
+        key = (font, text, color)
+        surf = self.text_cache.get(key)
+        if surf is not None:
+            self.text_cache.move_to_end(key)
+            return surf
+        surf = font.render(text, True, color)
+        self.text_cache[key] = surf
+        if len(self.text_cache) > TEXT_CACHE_CAPACITY:
+            self.text_cache.popitem(last=False)
+        return surf
+
+    def setup_buttons(self):
+        """Membuat dan menyimpan objek tombol UI sekali (tanpa posisi Y tetap)."""
+        self.buttons = []
+        
+        # Posisi relatif di panel info (SIM_SIZE hingga SCREEN_WIDTH)
+        x_start_panel = SIM_SIZE + 10 
+        width_max = INFO_WIDTH - 20 
+        button_h = 35 
+        
+        # Posisi Y akan ditetapkan secara dinamis di draw
+        DUMMY_Y = 0 
+        
+        # Tombol 1: Tanam Pohon
+        btn_plant = Button(x_start_panel, DUMMY_Y, width_max, button_h, 
+                           "🌱 Tanam Pohon (Mode Klik)", FONT_SMALL, 
+                           COLOR_BUTTON_SAFE, COLOR_BUTTON_SAFE_HOVER, 'plant_single')
+        self.buttons.append(btn_plant)
+        
+        # Tombol 2: Tebang Pohon Tunggal
+        btn_cut = Button(x_start_panel, DUMMY_Y, width_max, button_h, 
+                         "🔪 Tebang Pohon (Mode Klik)", FONT_SMALL, 
+                         COLOR_BUTTON_NORMAL, COLOR_BUTTON_HOVER, 'cut_single')
+        self.buttons.append(btn_cut)
+        
+        # Tombol 3: Tebang 20%
+        btn_cut_mass = Button(x_start_panel, DUMMY_Y, width_max, button_h, 
+                              "🔥 Tebang 20% Pohon (Massal)", FONT_SMALL, 
+                              COLOR_BUTTON_DANGER, COLOR_BUTTON_DANGER_HOVER, 'cut_mass')
+        self.buttons.append(btn_cut_mass)
+
+        # Tombol 4: Reset Simulasi (lebih tinggi 5px)
+        btn_reset = Button(x_start_panel, DUMMY_Y, width_max, button_h + 5, 
+                           "🔄 RESET SIMULASI", FONT_MEDIUM, 
+                           COLOR_BUTTON_RESET, COLOR_BUTTON_RESET_HOVER, 'reset')
+        self.buttons.append(btn_reset)
+
+    def _reposition_buttons(self, y_start):
+        """Reposisi tombol berdasarkan posisi Y yang diberikan."""
+        current_y = y_start
+        button_spacing = 8 # Spasi vertikal antar tombol
+        
+        # Tombol 1: Tanam Pohon (H: 35)
+        self.buttons[0].rect.y = current_y
+        current_y += self.buttons[0].rect.height + button_spacing
+        
+        # Tombol 2: Tebang Pohon Tunggal (H: 35)
+        self.buttons[1].rect.y = current_y
+        current_y += self.buttons[1].rect.height + button_spacing
+        
+        # Tombol 3: Tebang 20% (H: 35)
+        self.buttons[2].rect.y = current_y
+        current_y += self.buttons[2].rect.height + button_spacing
+
+        # Tombol 4: Reset Simulasi (H: 40)
+        current_y += 10 # Spasi ekstra sebelum tombol reset
+        self.buttons[3].rect.y = current_y
+        current_y += self.buttons[3].rect.height + button_spacing 
+        
+        return current_y # Mengembalikan posisi Y setelah tombol terakhir
+
+    def draw_container_frame(self, surf, rect, padding=5, border_thickness=2):
+        container_rect = rect.inflate(-padding * 2, -padding * 2)
+        pygame.draw.rect(surf, COLOR_UI_DARK, container_rect, border_radius=5)
+
+        pygame.draw.line(surf, COLOR_UI_HIGHLIGHT, (container_rect.left, container_rect.bottom), 
+                         (container_rect.left, container_rect.top), border_thickness)
+        pygame.draw.line(surf, COLOR_UI_HIGHLIGHT, (container_rect.left, container_rect.top), 
+                         (container_rect.right, container_rect.top), border_thickness)
+        
+        pygame.draw.line(surf, COLOR_UI_BORDER, (container_rect.right, container_rect.top), 
+                         (container_rect.right, container_rect.bottom), border_thickness)
+        pygame.draw.line(surf, COLOR_UI_BORDER, (container_rect.right, container_rect.bottom), 
+                         (container_rect.left, container_rect.bottom), border_thickness)
+        
+        return container_rect.left + padding, container_rect.top + padding, container_rect.width - 2 * padding
+        
+
+    def _display_state(self, sim, current_mode):
+        """Semua nilai yang tampil di panel, pada presisi tampilannya."""
+        if sim.is_raining:
+            status = ("HUJAN LEBAT!", COLOR_WATER,
+                      f"RISIKO {sim.disaster_type.upper()} TINGGI ({sim.rain_duration - sim.rain_timer:.1f}s)")
+        elif sim.disaster_active:
+            status = (DISASTER_NAMES.get(sim.disaster_type, 'BAHAYA!'), COLOR_DANGER,
+                      f"AKTIF ({sim.disaster_timer:.1f}s tersisa)")
+        else:
+            status = WARNING_STATUS[sim.warning_level]
+        return (status, f"{sim.erosion_risk*100:.1f}%", lerp_color(COLOR_SAFE, COLOR_DANGER, sim.erosion_risk),
+                len(sim.trees), sim.stump_count, sim.total_disasters, sim.trees_lost_to_disaster, current_mode,
+                tuple(button.is_hovered for button in self.buttons))
+
+    def draw(self, surface, sim, current_mode):
+        """Blit panel yang di-cache, membangunnya ulang hanya bila nilai tampilan berubah."""
+        state = self._display_state(sim, current_mode)
+        if state != self.state:
+            self.state = state
+            self._render(sim.erosion_risk, *state)
+            self.rebuilds += 1
+        surface.blit(self.surface, (SIM_SIZE, 0))
+
+        if self.flash_icon is not None and (sim.warning_level >= 1 or sim.disaster_active):
+            flash_opacity = abs(math.sin(sim.warning_flash)) 
+            if flash_opacity > 0.5:
+                surface.blit(*self.flash_icon)
+
+    def _render(self, erosion_risk, status, risk_text, bar_color, trees, stumps, disasters, trees_lost,
+                current_mode, hovered):
+        """Menggambar panel informasi dengan struktur container yang halus ke surface offscreen."""
+        surface = self.surface
+        text = self.text
+        
+        # --- A. FRAME LUAR UTAMA ---
+        info_rect = pygame.Rect(0, 0, INFO_WIDTH, SCREEN_HEIGHT)
+        pygame.draw.rect(surface, COLOR_DARK_BLUE, info_rect)
+        pygame.draw.rect(surface, COLOR_UI_BORDER, info_rect, 3) 
+        
+        panel_area = info_rect.inflate(-10, -10)
+        
+        x_offset = panel_area.left
+        y_cursor = panel_area.top + 5 
+        width_max = panel_area.width
+        line_spacing = 25 
+        
+        # 1. Judul
+        title_text = text(FONT_LARGE, "Simulasi Deforestasi", COLOR_WHITE)
+        surface.blit(title_text, (x_offset + 5, y_cursor))
+        y_cursor += line_spacing * 2
+        
+        # --- 2. CONTAINER STATUS & BENCANA ---
+        status_container_height = 80 
+        status_rect = pygame.Rect(x_offset, y_cursor, width_max, status_container_height)
+        start_x, start_y, cont_width = self.draw_container_frame(surface, status_rect, padding=5) 
+        
+        status_name, status_color, detail_text = status
+        main_status_text = text(FONT_MEDIUM, status_name, status_color)
+        surface.blit(main_status_text, (start_x, start_y))
+        
+        detail_status_text = text(FONT_SMALL, detail_text, COLOR_WHITE)
+        surface.blit(detail_status_text, (start_x, start_y + line_spacing))
+
+        # Tanda "!" berkedip digambar draw() sebagai overlay, bukan bagian dari cache
+        self.flash_icon = (text(FONT_MEDIUM, "!", status_color),
+                           (SIM_SIZE + start_x + main_status_text.get_width() + 5, start_y))
+            
+        y_cursor += status_container_height + 5 
+
+
+        # --- 3. CONTAINER STATISTIK (DITINGGIKAN) ---
+        stats_container_height = 180 # Ditingkatkan dari ~140 ke 180
+        stats_rect = pygame.Rect(x_offset, y_cursor, width_max, stats_container_height)
+        start_x, start_y, cont_width = self.draw_container_frame(surface, stats_rect, padding=5)
+
+        # Bar Risiko Erosi
+        bar_y = start_y 
+        bar_h = 12 
+        
+        risk_label = text(FONT_SMALL, "RISIKO EROSI", COLOR_WHITE)
+        surface.blit(risk_label, (start_x, bar_y))
+        bar_y += 18 
+        
+        pygame.draw.rect(surface, (50, 50, 50), (start_x, bar_y, cont_width, bar_h), border_radius=3)
+        pygame.draw.rect(surface, bar_color, (start_x, bar_y, int(cont_width * erosion_risk), bar_h), border_radius=3)
+        risk_value = text(FONT_TINY, risk_text, COLOR_WHITE)
+        surface.blit(risk_value, (start_x + cont_width - risk_value.get_width() - 5, bar_y + 1))
+        
+        current_y = bar_y + line_spacing 
+        info_lines = [
+            (f"Pohon Aktif: {trees}", COLOR_WHITE),
+            (f"Tunggul: {stumps}", COLOR_STUMP_TOP),
+            (f"Total Bencana: {disasters}", COLOR_WARNING),
+            (f"Pohon Hilang: {trees_lost}", COLOR_DANGER),
+        ]
+
+        for line, color in info_lines:
+            surface.blit(text(FONT_SMALL, line, color), (start_x, current_y))
+            current_y += line_spacing
+            
+        # Posisi tombol ditetapkan sekali di __init__ (tata letak di atasnya tetap)
+        for button in self.buttons:
+            button.draw(surface, (SIM_SIZE, 0), text(button.font, button.text, COLOR_WHITE))
+
+        # --- 4. CONTAINER KONTROL & TUJUAN (DIKECILKAN) ---
+        
+        # Posisi awal Active Mode container (tepat setelah tombol terakhir)
+        control_rect_y = self.button_y_end 
+        
+        # Mengurangi tinggi container mode aktif dengan membatasi ketinggian (max 70px)
+        MAX_CONTROL_HEIGHT = 70 
+        control_container_height = min(MAX_CONTROL_HEIGHT, SCREEN_HEIGHT - control_rect_y - 10)
+        
+        control_rect = pygame.Rect(x_offset, control_rect_y, width_max, control_container_height)
+        start_x, start_y, cont_width = self.draw_container_frame(surface, control_rect, padding=5)
+        
+        current_y = start_y
+        
+        # Informasi Mode Aktif
+        mode_text = text(FONT_MEDIUM, f"MODE AKTIF:", COLOR_UI_HIGHLIGHT)
+        surface.blit(mode_text, (start_x, current_y))
+        
+        mode_name = current_mode.replace('_', ' ').upper()
+        mode_detail_color = COLOR_BUTTON_SAFE if 'plant' in current_mode else COLOR_BUTTON_NORMAL
+        mode_detail = text(FONT_MEDIUM, mode_name, mode_detail_color)
+        surface.blit(mode_detail, (start_x + mode_text.get_width() + 5, current_y))
+
+# ============ Overlay Profiler ============
+class ProfilerOverlay:
+    """Tabel ms per fase dan counter dari FrameProfiler, digambar di pojok kiri atas."""
+    def __init__(self):
+        if FONT_TINY is None:
+            init_fonts()
+        self.visible = False
+
+    def draw(self, surface, profiler):
+        if not self.visible:
+            return
+        stats = profiler.stats()
+        lines = [f"{'fase':12s}{'ms':>7s}{'p95':>7s}"]
+        for name, s in stats['phases'].items():
+            lines.append(f"{name:12s}{s['mean']:7.2f}{s['p95']:7.2f}")
+        for name, s in stats['counters'].items():
+            lines.append(f"{name:12s}{s['last']:7.0f}{s['max']:7.0f}")
+
+        line_h = FONT_TINY.get_linesize()
+        width = max(FONT_TINY.size(line)[0] for line in lines) + 12
+        panel = pygame.Surface((width, line_h * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for k, line in enumerate(lines):
+            color = COLOR_WARNING if k and line.startswith('frame') else COLOR_WHITE
+            panel.blit(FONT_TINY.render(line, True, color), (6, 4 + k * line_h))
+        surface.blit(panel, (4, 4))